@@ -1,9 +1,25 @@
+import io
+import itertools
 import re
 import os
 import struct
 import numpy as np
-from euphonic import ureg
-from euphonic.util import reciprocal_lattice, is_gamma
+from euphonic.util import (reciprocal_lattice, is_gamma, _ANGSTROM_TO_BOHR,
+                           _AMU_TO_E_MASS, _INV_CM_TO_E_H)
+
+
+# Patterns for reading q-point header lines in .phonon files
+_QPT_NUM_PATT = re.compile(r'q-pt=\s*(\d+)')
+_FLOAT_PATT = re.compile(r'-?\d+\.\d+')
+
+# Precompiled structs for unpacking big-endian Fortran binary data
+_U_I32 = struct.Struct('>i')
+_U_F64 = struct.Struct('>d')
+# Element size in bytes, native type to convert arrays to, and struct to
+# unpack single values with, for each dtype read from binary files
+_DTYPE_INFO = {'>i4': (4, np.int32, _U_I32),
+               '>f8': (8, np.float64, _U_F64),
+               'S8': (8, None, None)}
 
 
 def _read_phonon_data(seedname, path):
@@ -27,7 +43,7 @@ def _read_phonon_data(seedname, path):
         Meta information: 'seedname', 'path' and 'model'.
     """
     file = os.path.join(path, seedname + '.phonon')
-    with open(file, 'r') as f:
+    with _read_to_buffer(file, 'r') as f:
 
         (n_ions, n_branches, n_qpts, cell_vec, ion_r,
          ion_type, ion_mass) = _read_phonon_header(f)
@@ -39,83 +55,92 @@ def _read_phonon_data(seedname, path):
         raman = np.array([])
         eigenvecs = np.zeros((n_qpts, n_branches, n_ions, 3),
                              dtype='complex128')
-        split_i = np.array([], dtype=np.int32)
-        split_freqs = np.empty((0, n_branches))
-        split_eigenvecs = np.empty((0, n_branches, n_ions, 3))
+        # Accumulate LO-TO split q-points in lists and only convert to arrays
+        # once the whole file has been read
+        split_i = []
+        split_freqs = []
+        split_eigenvecs = []
 
         # Need to loop through file using while rather than number of q-points
         # as sometimes points are duplicated
-        first_qpt = True
         qpt_line = f.readline()
         prev_qpt_num = -1
-        qpt_num_patt = re.compile('q-pt=\s*(\d+)')
-        float_patt = re.compile('-?\d+\.\d+')
         while qpt_line:
-            qpt_num = int(re.search(qpt_num_patt, qpt_line).group(1)) - 1
-            floats = re.findall(float_patt, qpt_line)
-            qpts[qpt_num] = [float(x) for x in floats[:3]]
-            weights[qpt_num] = float(floats[3])
-
-            freq_lines = [f.readline().split() for i in range(n_branches)]
-            tmp = np.array([float(line[1]) for line in freq_lines])
+            qpt_num = int(_QPT_NUM_PATT.search(qpt_line).group(1)) - 1
+            floats = list(map(float, _FLOAT_PATT.findall(qpt_line)))
+            qpts[qpt_num] = floats[:3]
+            weights[qpt_num] = floats[3]
+            gamma = is_gamma(qpts[qpt_num])
+
+            # Read all frequency lines for this q-point as a single block
+            freq_block = np.fromstring(
+                _read_lines(f, n_branches), sep=' ').reshape(n_branches, -1)
+            tmp = freq_block[:, 1]
             if qpt_num != prev_qpt_num:
                 freqs[qpt_num, :] = tmp
-            elif is_gamma(qpts[qpt_num]):
-                split_i = np.concatenate((split_i, [qpt_num]))
-                split_freqs = np.concatenate((split_freqs, tmp[np.newaxis]))
-            ir_index = 2
-            raman_index = 3
-            if is_gamma(qpts[qpt_num]):
-                ir_index += 1
-                raman_index += 1
-            if len(freq_lines[0]) > ir_index:
-                if first_qpt:
+            elif gamma:
+                split_i.append(qpt_num)
+                split_freqs.append(tmp)
+            # Gamma points have an extra column before the IR/Raman data
+            ir_index = 3 if gamma else 2
+            raman_index = ir_index + 1
+            # IR/Raman arrays are only allocated once the first q-point with
+            # that data is found, as they aren't always present
+            if freq_block.shape[1] > ir_index:
+                if ir.size == 0:
                     ir = np.zeros((n_qpts, n_branches))
-                ir[qpt_num, :] = [float(
-                    line[ir_index]) for line in freq_lines]
-            if len(freq_lines[0]) > raman_index:
-                if first_qpt:
+                ir[qpt_num, :] = freq_block[:, ir_index]
+            if freq_block.shape[1] > raman_index:
+                if raman.size == 0:
                     raman = np.zeros((n_qpts, n_branches))
-                raman[qpt_num, :] = [float(
-                    line[raman_index]) for line in freq_lines]
+                raman[qpt_num, :] = freq_block[:, raman_index]
 
             [f.readline() for x in range(2)]  # Skip 2 label lines
-            lines = np.array([f.readline().split()[2:]
-                              for x in range(n_ions*n_branches)],
-                             dtype=np.float64)
-            lines_i = np.column_stack(([lines[:, 0] + lines[:, 1]*1j,
-                                        lines[:, 2] + lines[:, 3]*1j,
-                                        lines[:, 4] + lines[:, 5]*1j]))
-            tmp = np.zeros((n_branches, n_ions, 3), dtype=np.complex128)
-            for i in range(n_branches):
-                    tmp[i, :, :] = lines_i[i*n_ions:(i+1)*n_ions, :]
+            # Read all eigenvector lines as a single block, ignoring the
+            # mode and ion index columns
+            lines = np.fromstring(
+                _read_lines(f, n_ions*n_branches), sep=' ').reshape(
+                    n_ions*n_branches, -1)[:, 2:]
+            # Each consecutive pair of floats is the real and imaginary
+            # part of an eigenvector component, so reinterpret as complex
+            tmp = np.ascontiguousarray(lines).view(np.complex128).reshape(
+                n_branches, n_ions, 3)
             if qpt_num != prev_qpt_num:
                 eigenvecs[qpt_num] = tmp
-            elif is_gamma(qpts[qpt_num]):
-                split_eigenvecs = np.concatenate(
-                    (split_eigenvecs, tmp[np.newaxis]))
-            first_qpt = False
+            elif gamma:
+                split_eigenvecs.append(tmp)
             qpt_line = f.readline()
             prev_qpt_num = qpt_num
 
+    split_i = np.array(split_i, dtype=np.int32)
+    if len(split_i) > 0:
+        split_freqs = np.stack(split_freqs)
+        split_eigenvecs = np.stack(split_eigenvecs)
+    else:
+        split_freqs = np.empty((0, n_branches))
+        split_eigenvecs = np.empty((0, n_branches, n_ions, 3),
+                                   dtype=np.complex128)
+
+    # Convert frequencies to atomic units in place rather than allocating
+    # another array of the same size for the result
+    freqs *= _INV_CM_TO_E_H
+    split_freqs *= _INV_CM_TO_E_H
+
     data_dict = {}
     data_dict['n_ions'] = n_ions
     data_dict['n_branches'] = n_branches
     data_dict['n_qpts'] = n_qpts
-    data_dict['cell_vec'] = (cell_vec*ureg('angstrom').to('bohr')).magnitude
-    data_dict['recip_vec'] = ((reciprocal_lattice(cell_vec)/ureg.angstrom)
-                              .to('1/bohr')).magnitude
+    data_dict['cell_vec'] = cell_vec*_ANGSTROM_TO_BOHR
+    data_dict['recip_vec'] = reciprocal_lattice(cell_vec)/_ANGSTROM_TO_BOHR
     data_dict['ion_r'] = ion_r
     data_dict['ion_type'] = ion_type
-    data_dict['ion_mass'] = ion_mass*(ureg('amu')).to('e_mass').magnitude
+    data_dict['ion_mass'] = ion_mass*_AMU_TO_E_MASS
     data_dict['qpts'] = qpts
     data_dict['weights'] = weights
-    data_dict['freqs'] = ((freqs*(1/ureg.cm)).
-                          to('E_h', 'spectroscopy')).magnitude
+    data_dict['freqs'] = freqs
     data_dict['eigenvecs'] = eigenvecs
     data_dict['split_i'] = split_i
-    data_dict['split_freqs'] = ((split_freqs*(1/ureg.cm))
-                                .to('E_h', 'spectroscopy')).magnitude
+    data_dict['split_freqs'] = split_freqs
     data_dict['split_eigenvecs'] = split_eigenvecs
 
     # Meta information
@@ -158,13 +183,18 @@ def _read_phonon_header(f):
     n_branches = int(f.readline().split()[3])
     n_qpts = int(f.readline().split()[3])
     [f.readline() for x in range(4)]  # Skip units and label lines
-    cell_vec = np.array([[float(x) for x in f.readline().split()[0:3]]
-                         for i in range(3)])
+    cell_vec = np.fromstring(f.readline() + f.readline() + f.readline(),
+                             sep=' ').reshape(3, 3)
     f.readline()  # Skip fractional co-ordinates label
-    ion_info = np.array([f.readline().split() for i in range(n_ions)])
-    ion_r = np.array([[float(x) for x in y[1:4]] for y in ion_info])
-    ion_type = np.array([x[4] for x in ion_info])
-    ion_mass = np.array([float(x[5]) for x in ion_info])
+    ion_info = np.loadtxt(
+        io.StringIO(_read_lines(f, n_ions)),
+        dtype=[('index', 'i4'), ('r', 'f8', (3,)), ('type', 'U16'),
+               ('mass', 'f8')],
+        ndmin=1)
+    # Copy fields so they are contiguous rather than views of ion_info
+    ion_r = np.ascontiguousarray(ion_info['r'])
+    ion_type = np.ascontiguousarray(ion_info['type'])
+    ion_mass = np.ascontiguousarray(ion_info['mass'])
     f.readline()  # Skip END header line
 
     return n_ions, n_branches, n_qpts, cell_vec, ion_r, ion_type, ion_mass
@@ -197,14 +227,14 @@ def _read_interpolation_data(seedname, path):
             .format(seedname, seedname))
         file = os.path.join(path, seedname + '.check')
 
-    with open(file, 'rb') as f:
+    with _read_to_buffer(file, 'rb') as f:
         int_type = '>i4'
         float_type = '>f8'
-        header = ''
+        header = b''
         first_cell_read = True
-        while header.strip() != b'END':
-            header = _read_entry(f)
-            if header.strip() == b'BEGIN_UNIT_CELL':
+        while header != b'END':
+            header = _read_entry(f).strip()
+            if header == b'BEGIN_UNIT_CELL':
                 # CASTEP writes the cell twice: the first is the geometry
                 # optimised cell, the second is the original cell. We only
                 # want the geometry optimised cell.
@@ -212,9 +242,10 @@ def _read_interpolation_data(seedname, path):
                     n_ions, cell_vec, ion_r, ion_mass, ion_type = _read_cell(
                         f, int_type, float_type)
                     first_cell_read = False
-            elif header.strip() == b'FORCE_CON':
-                sc_matrix = np.transpose(np.reshape(
-                    _read_entry(f, int_type), (3, 3)))
+            elif header == b'FORCE_CON':
+                # 3 x 3 arrays are stored in Fortran order
+                sc_matrix = np.reshape(
+                    _read_entry(f, int_type), (3, 3), order='F')
                 n_cells_in_sc = int(np.rint(np.absolute(
                     np.linalg.det(sc_matrix))))
                 # Transpose and reshape fc so it is indexed [nc, i, j]
@@ -225,12 +256,12 @@ def _read_interpolation_data(seedname, path):
                 cell_origins = np.reshape(
                     _read_entry(f, int_type), (n_cells_in_sc, 3))
                 fc_row = _read_entry(f, int_type)
-            elif header.strip() == b'BORN_CHGS':
+            elif header == b'BORN_CHGS':
                 born = np.reshape(
                     _read_entry(f, float_type), (n_ions, 3, 3))
-            elif header.strip() == b'DIELECTRIC':
-                dielectric = np.transpose(np.reshape(
-                    _read_entry(f, float_type), (3, 3)))
+            elif header == b'DIELECTRIC':
+                dielectric = np.reshape(
+                    _read_entry(f, float_type), (3, 3), order='F')
 
     data_dict = {}
     data_dict['n_ions'] = n_ions
@@ -297,29 +328,29 @@ def _read_cell(file_obj, int_type, float_type):
         The chemical symbols of each ion in the unit cell. Ions are in the
         same order as in ion_r
     """
-    header = ''
-    while header.strip() != b'END_UNIT_CELL':
-        header = _read_entry(file_obj)
-        if header.strip() == b'CELL%NUM_IONS':
+    header = b''
+    while header != b'END_UNIT_CELL':
+        header = _read_entry(file_obj).strip()
+        if header == b'CELL%NUM_IONS':
             n_ions = _read_entry(file_obj, int_type)
-        elif header.strip() == b'CELL%REAL_LATTICE':
-            cell_vec = np.transpose(np.reshape(
-                _read_entry(file_obj, float_type), (3, 3)))
-        elif header.strip() == b'CELL%NUM_SPECIES':
+        elif header == b'CELL%REAL_LATTICE':
+            cell_vec = np.reshape(
+                _read_entry(file_obj, float_type), (3, 3), order='F')
+        elif header == b'CELL%NUM_SPECIES':
             n_species = _read_entry(file_obj, int_type)
-        elif header.strip() == b'CELL%NUM_IONS_IN_SPECIES':
+        elif header == b'CELL%NUM_IONS_IN_SPECIES':
             n_ions_in_species = _read_entry(file_obj, int_type)
             if n_species == 1:
                 n_ions_in_species = np.array([n_ions_in_species])
-        elif header.strip() == b'CELL%IONIC_POSITIONS':
+        elif header == b'CELL%IONIC_POSITIONS':
             max_ions_in_species = max(n_ions_in_species)
             ion_r_tmp = np.reshape(_read_entry(file_obj, float_type),
                                    (n_species, max_ions_in_species, 3))
-        elif header.strip() == b'CELL%SPECIES_MASS':
+        elif header == b'CELL%SPECIES_MASS':
             ion_mass_tmp = _read_entry(file_obj, float_type)
             if n_species == 1:
                 ion_mass_tmp = np.array([ion_mass_tmp])
-        elif header.strip() == b'CELL%SPECIES_SYMBOL':
+        elif header == b'CELL%SPECIES_SYMBOL':
             # Need to decode binary string for Python 3 compatibility
             if n_species == 1:
                 ion_type_tmp = [_read_entry(file_obj, 'S8')
@@ -329,24 +360,14 @@ def _read_cell(file_obj, int_type, float_type):
                                 for x in _read_entry(file_obj, 'S8')]
     # Get ion_r in correct form
     # CASTEP stores ion positions as 3D array (3,
-    # max_ions_in_species, n_species) so need to slice data to get
-    # correct information
-    ion_begin = np.insert(np.cumsum(n_ions_in_species[:-1]), 0, 0)
-    ion_end = np.cumsum(n_ions_in_species)
-    ion_r = np.zeros((n_ions, 3))
-    for i in range(n_species):
-        ion_r[ion_begin[i]:ion_end[i], :] = ion_r_tmp[
-            i, :n_ions_in_species[i], :]
-    # Get ion_type in correct form
-    ion_type = np.array([])
-    ion_mass = np.array([])
-    for ion in range(n_species):
-        ion_type = np.append(
-            ion_type,
-            [ion_type_tmp[ion] for i in range(n_ions_in_species[ion])])
-        ion_mass = np.append(
-            ion_mass,
-            [ion_mass_tmp[ion] for i in range(n_ions_in_species[ion])])
+    # max_ions_in_species, n_species) so need to mask out the unused
+    # entries for species with fewer than max_ions_in_species ions
+    ion_mask = (np.arange(max_ions_in_species)[np.newaxis, :]
+                < n_ions_in_species[:, np.newaxis])
+    ion_r = ion_r_tmp[ion_mask]
+    # Get ion_type and ion_mass in correct form
+    ion_type = np.repeat(np.array(ion_type_tmp), n_ions_in_species)
+    ion_mass = np.repeat(ion_mass_tmp, n_ions_in_species)
 
     return n_ions, cell_vec, ion_r, ion_mass, ion_type
 
@@ -373,37 +394,35 @@ def _read_entry(file_obj, dtype=''):
         integers
 
     """
-    def record_mark_read(file_obj):
-        # Read 4 byte Fortran record marker
-        rawdata = file_obj.read(4)
-        if rawdata == b'':
-            raise EOFError(
-                'Problem reading binary file: unexpected EOF reached')
-        return struct.unpack('>i', rawdata)[0]
-
-    begin = record_mark_read(file_obj)
+    read = file_obj.read
+    # Read 4 byte Fortran record marker
+    rawdata = read(4)
+    if len(rawdata) < 4:
+        raise EOFError(
+            'Problem reading binary file: unexpected EOF reached')
+    begin = _U_I32.unpack(rawdata)[0]
+    # Read the data and end record marker in one go
+    record = read(begin + 4)
+    if len(record) < begin + 4:
+        raise EOFError(
+            'Problem reading binary file: unexpected EOF reached')
+    end = _U_I32.unpack_from(record, begin)[0]
+    if begin != end:
+        raise IOError("""Problem reading binary file: beginning and end
+                         record markers do not match""")
     if dtype:
-        n_bytes = int(dtype[-1])
-        n_elems = int(begin/n_bytes)
+        n_bytes, native_type, unpacker = _DTYPE_INFO[dtype]
+        n_elems = begin//n_bytes
         if n_elems > 1:
-            data = np.fromfile(file_obj, dtype=dtype, count=n_elems)
-            if 'i' in dtype:
-                data = data.astype(np.int32)
-            elif 'f' in dtype:
-                data = data.astype(np.float64)
+            data = np.frombuffer(record, dtype=dtype, count=n_elems)
+            if native_type is not None:
+                data = data.astype(native_type)
+        elif unpacker is not None:
+            data = unpacker.unpack_from(record)[0]
         else:
-            if 'i' in dtype:
-                data = struct.unpack('>i', file_obj.read(begin))[0]
-            elif 'f' in dtype:
-                data = struct.unpack('>d', file_obj.read(begin))[0]
-            else:
-                data = file_obj.read(begin)
+            data = record[:begin]
     else:
-        data = file_obj.read(begin)
-    end = record_mark_read(file_obj)
-    if begin != end:
-        raise IOError("""Problem reading binary file: beginning and end
-                         record markers do not match""")
+        data = record[:begin]
 
     return data
 
@@ -431,46 +450,45 @@ def _read_bands_data(seedname, path):
     """
 
     file = os.path.join(path, seedname + '.bands')
-    with open(file, 'r') as f:
+    with _read_to_buffer(file, 'r') as f:
         n_qpts = int(f.readline().split()[3])
         n_spins = int(f.readline().split()[4])
         f.readline()  # Skip number of electrons line
         n_branches = int(f.readline().split()[3])
         fermi = np.array([float(x) for x in f.readline().split()[5:]])
         f.readline()  # Skip unit cell vectors line
-        cell_vec = [[float(x) for x in f.readline().split()[0:3]]
-                    for i in range(3)]
-
-        qpts = np.zeros((n_qpts, 3))
-        weights = np.zeros(n_qpts)
-        freqs_qpt = np.zeros(n_branches)
-        freqs = np.zeros((n_qpts, n_branches))
+        cell_vec = np.fromstring(f.readline() + f.readline() + f.readline(),
+                                 sep=' ').reshape(3, 3)
+
+        # The rest of the file is a repeated K-point/Spin component record.
+        # Once the text labels are removed it is just a flat list of numbers,
+        # so parse it all at once and reshape to one row per record
+        body = f.read().replace('K-point', '').replace('Spin component', '')
+    record_size = 5 + n_spins*(1 + n_branches)
+    records = np.fromstring(body, sep=' ').reshape(-1, record_size)
+
+    # Index by k-point number rather than record order as sometimes points
+    # are duplicated
+    qpt_num = records[:, 0].astype(np.int32) - 1
+
+    # Allocate the output arrays as contiguous views of a single buffer
+    buf = np.zeros(n_qpts*(4 + n_spins*n_branches))
+    qpts = buf[:3*n_qpts].reshape(n_qpts, 3)
+    weights = buf[3*n_qpts:4*n_qpts]
+    freqs = buf[4*n_qpts:(4 + n_branches)*n_qpts].reshape(n_qpts, n_branches)
+    if n_spins == 2:
+        freq_down = buf[(4 + n_branches)*n_qpts:].reshape(n_qpts, n_branches)
+    else:
+        freq_down = np.array([])
+    qpts[qpt_num] = records[:, 1:4]
+    weights[qpt_num] = records[:, 4]
+    spin_blocks = records[:, 5:].reshape(-1, n_spins, 1 + n_branches)
+    for j in range(n_spins):
+        spin = spin_blocks[:, j, 0].astype(np.int32)
+        freqs_spin = spin_blocks[:, j, 1:]
+        freqs[qpt_num[spin == 1]] = freqs_spin[spin == 1]
         if n_spins == 2:
-            freq_down = np.zeros((n_qpts, n_branches))
-        else:
-            freq_down = np.array([])
-
-        # Need to loop through file using while rather than number of k-points
-        # as sometimes points are duplicated
-        line = f.readline().split()
-        while line:
-            qpt_num = int(line[1]) - 1
-            qpts[qpt_num, :] = [float(x) for x in line[2:5]]
-            weights[qpt_num] = float(line[5])
-
-            for j in range(n_spins):
-                spin = int(f.readline().split()[2])
-
-                # Read frequencies
-                for k in range(n_branches):
-                    freqs_qpt[k] = float(f.readline())
-
-                if spin == 1:
-                    freqs[qpt_num, :] = freqs_qpt
-                elif spin == 2:
-                    freq_down[qpt_num, :] = freqs_qpt
-
-            line = f.readline().split()
+            freq_down[qpt_num[spin == 2]] = freqs_spin[spin == 2]
 
     data_dict = {}
     data_dict['n_qpts'] = n_qpts
@@ -538,11 +556,61 @@ def _read_castep_data(seedname, path):
             if 'Fractional coordinates of atoms' in line:
                 f.readline()  # Skip uvw line
                 f.readline()  # Skip --- line
-                ion_info = [f.readline().split() for i in range(n_ions)]
-                ion_r = np.array([[float(x) for x in line[-4:-1]]
-                                  for line in ion_info])
-                ion_type = np.array([x[1] for x in ion_info])
+                # Lines are of the form:
+                # x  Element  Number  u  v  w  x
+                ion_info = np.loadtxt(
+                    io.StringIO(_read_lines(f, n_ions)), usecols=(1, 3, 4, 5),
+                    dtype=[('type', 'U16'), ('r', 'f8', (3,))], ndmin=1)
+                ion_r = np.ascontiguousarray(ion_info['r'])
+                ion_type = np.ascontiguousarray(ion_info['type'])
                 ion_info_read = True
             line = f.readline()
 
     return n_ions, ion_r, ion_type
+
+
+def _read_to_buffer(file, mode='r'):
+    """
+    Reads the entire contents of a file at once and returns them as an
+    in-memory file object, so the parsers don't have to make many small
+    reads from disk
+
+    Parameters
+    ----------
+    file : str
+        Path to the file to read
+    mode : {'r', 'rb'}, optional, default 'r'
+        Whether to read the file in text or binary mode
+
+    Returns
+    -------
+    buf : io.StringIO or io.BytesIO
+        The file contents, positioned at the beginning
+    """
+    with open(file, mode) as f:
+        contents = f.read()
+    if 'b' in mode:
+        return io.BytesIO(contents)
+    else:
+        return io.StringIO(contents)
+
+
+def _read_lines(f, n):
+    """
+    Reads the next n lines from a text file object and joins them into a
+    single string, so a whole block of numbers can be parsed in one call
+    (e.g. with np.fromstring)
+
+    Parameters
+    ----------
+    f : file object
+        File object in read mode for a text file
+    n : int
+        The number of lines to read
+
+    Returns
+    -------
+    lines : str
+        The n lines, including their newline characters
+    """
+    return ''.join(itertools.islice(f, n))
@@ -196,7 +196,7 @@ class InterpolationData(PhononData):
     def calculate_fine_phonons(
         self, qpts, asr=None, precondition=False, dipole=True,
             eta_scale=1.0, splitting=True, reduce_qpts=True, use_c=False,
-            n_threads=1):
+            n_threads=1, calc_eigenvecs=True, dtype=np.float64):
         """
         Calculate phonon frequencies and eigenvectors at specified q-points
         from a supercell force constant matrix via interpolation. For more
@@ -233,6 +233,19 @@ class InterpolationData(PhononData):
         n_threads : int, optional, default 1
             The number of threads to use when looping over q-points in C. Only
             applicable if use_c=True
+        calc_eigenvecs : boolean, optional, default True
+            Whether to calculate the eigenvectors. If only the frequencies are
+            needed (e.g. for a DOS) set to False, which uses the faster
+            eigenvalue-only solver. The structure factor, Debye-Waller factor
+            and frequency reordering require eigenvectors. Only applicable if
+            use_c=False, the C extension always calculates eigenvectors
+        dtype : numpy dtype, optional, default np.float64
+            The floating point precision to use when calculating and
+            diagonalising the dynamical matrices. np.float32 roughly halves
+            the memory traffic, but small frequencies (e.g. acoustic modes
+            near gamma) lose accuracy as the error in the eigenvalues is
+            relative to the largest eigenvalue. Only applicable if
+            use_c=False
 
         Returns
         -------
@@ -295,55 +308,80 @@ class InterpolationData(PhononData):
 
         lim = 2  # Supercell image limit
         # Construct list of supercell ion images
-        if not hasattr(self, 'sc_image_i'):
+        if not hasattr(self, '_sc_image_i'):
             self._calculate_supercell_images(lim)
 
         # Get a list of all the unique supercell image origins and cell origins
         # in x, y, z and how to rebuild them to minimise expensive phase
-        # calculations later
-        sc_image_r = self._get_all_origins(
-            np.repeat(lim, 3) + 1, min_xyz=-np.repeat(lim, 3))
-        sc_offsets = np.einsum('ji,kj->ki', self.sc_matrix,
-                               sc_image_r).astype(np.int32)
-        unique_sc_offsets = [[] for i in range(3)]
-        unique_sc_i = np.zeros((len(sc_offsets), 3), dtype=np.int32)
-        unique_cell_origins = [[] for i in range(3)]
-        unique_cell_i = np.zeros((len(self.cell_origins), 3), dtype=np.int32)
-        for i in range(3):
-            unique_sc_offsets[i], unique_sc_i[:, i] = np.unique(
-                sc_offsets[:, i], return_inverse=True)
-            unique_cell_origins[i], unique_cell_i[:, i] = np.unique(
-                self.cell_origins[:, i], return_inverse=True)
-
-        # Precompute dynamical matrix mass weighting
-        masses = np.tile(np.repeat(self._ion_mass, 3), (3*n_ions, 1))
-        dyn_mat_weighting = 1/np.sqrt(masses*np.transpose(masses))
+        # calculations later. These and the mass weighting don't depend on
+        # the q-points so are only calculated once
+        if not hasattr(self, '_sc_offsets'):
+            sc_image_r = self._get_all_origins(
+                np.repeat(lim, 3) + 1, min_xyz=-np.repeat(lim, 3))
+            sc_offsets = np.einsum('ji,kj->ki', self.sc_matrix,
+                                   sc_image_r).astype(np.int32)
+            unique_sc_offsets = [[] for i in range(3)]
+            unique_sc_i = np.zeros((len(sc_offsets), 3), dtype=np.int32)
+            unique_cell_origins = [[] for i in range(3)]
+            unique_cell_i = np.zeros((len(self.cell_origins), 3),
+                                     dtype=np.int32)
+            for i in range(3):
+                unique_sc_offsets[i], unique_sc_i[:, i] = np.unique(
+                    sc_offsets[:, i], return_inverse=True)
+                unique_cell_origins[i], unique_cell_i[:, i] = np.unique(
+                    self.cell_origins[:, i], return_inverse=True)
+
+            # Precompute dynamical matrix mass weighting
+            inv_sqrt_mass = 1/np.sqrt(np.repeat(self._ion_mass, 3))
+            self._dyn_mat_weighting = np.outer(inv_sqrt_mass, inv_sqrt_mass)
+
+            self._sc_offsets = sc_offsets
+            self._unique_sc_offsets = unique_sc_offsets
+            self._unique_sc_i = unique_sc_i
+            self._unique_cell_origins = unique_cell_origins
+            self._unique_cell_i = unique_cell_i
+        sc_offsets = self._sc_offsets
+        unique_sc_offsets = self._unique_sc_offsets
+        unique_sc_i = self._unique_sc_i
+        unique_cell_origins = self._unique_cell_origins
+        unique_cell_i = self._unique_cell_i
+        dyn_mat_weighting = self._dyn_mat_weighting
 
         # Initialise dipole correction calculation to FC matrix if required
         if dipole and (not hasattr(self, 'eta_scale') or
                        eta_scale != self._eta_scale):
             self._dipole_correction_init(eta_scale)
 
+        # Precompute fc matrix weighted by number of supercell ion images
+        # (for cumulant method). This is also q-independent, so store it for
+        # each type of fc matrix (with or without the realspace ASR)
         if asr == 'realspace':
-            if not hasattr(self, '_force_constants_asr'):
-                self._force_constants_asr = self._enforce_realspace_asr()
-            force_constants = self._force_constants_asr
+            fc_img_attr = '_fc_img_weighted_asr'
         else:
-            force_constants = self._force_constants
-        # Precompute fc matrix weighted by number of supercell ion images
-        # (for cumulant method)
-        n_sc_images_repeat = (self._n_sc_images.
-            repeat(3, axis=2).repeat(3, axis=1))
-        fc_img_weighted = np.divide(
-            force_constants, n_sc_images_repeat, where=n_sc_images_repeat != 0)
+            fc_img_attr = '_fc_img_weighted'
+        if not hasattr(self, fc_img_attr):
+            if asr == 'realspace':
+                if not hasattr(self, '_force_constants_asr'):
+                    self._force_constants_asr = self._enforce_realspace_asr()
+                force_constants = self._force_constants_asr
+            else:
+                force_constants = self._force_constants
+            n_sc_images_repeat = (self._n_sc_images.
+                repeat(3, axis=2).repeat(3, axis=1))
+            setattr(self, fc_img_attr, np.divide(
+                force_constants, n_sc_images_repeat,
+                out=np.zeros(force_constants.shape),
+                where=n_sc_images_repeat != 0))
+        fc_img_weighted = getattr(self, fc_img_attr)
 
         recip_asr_correction = np.array([], dtype=np.complex128)
         if asr == 'reciprocal':
             # Calculate dyn mat at gamma for reciprocal ASR
             q_gamma = np.array([0., 0., 0.])
             dyn_mat_gamma = self._calculate_dyn_mat(
-                q_gamma, fc_img_weighted, unique_sc_offsets,
-                unique_sc_i, unique_cell_origins, unique_cell_i)
+                q_gamma, self._get_fc_img_upper(fc_img_attr, np.float64),
+                unique_sc_offsets, unique_sc_i, unique_cell_origins,
+                unique_cell_i)
             if dipole:
                 dyn_mat_gamma += self._calculate_dipole_correction(q_gamma)
             recip_asr_correction = self._enforce_reciprocal_asr(dyn_mat_gamma)
@@ -356,7 +394,8 @@ class InterpolationData(PhononData):
         split_eigenvecs = np.empty((0, 3*n_ions, n_ions, 3),
                                    dtype=np.complex128)
         rfreqs = np.zeros((n_rqpts, 3*n_ions))
-        reigenvecs = np.zeros((n_rqpts, 3*n_ions, n_ions, 3),
+        reigenvecs = np.zeros((n_rqpts if calc_eigenvecs or use_c else 0,
+                               3*n_ions, n_ions, 3),
                                   dtype=np.complex128)
         try:
             if use_c:
@@ -398,19 +437,51 @@ class InterpolationData(PhononData):
                 reciprocal_asr, splitting, rfreqs, reigenvecs, split_freqs,
                 split_eigenvecs, split_i, n_threads, scipy.__path__[0])
         except ImportError:
-            q_independent_args = (
-                reduced_qpts, qpts_i, fc_img_weighted, unique_sc_offsets,
-                unique_sc_i, unique_cell_origins, unique_cell_i,
-                recip_asr_correction, dyn_mat_weighting, dipole, asr,
-                splitting)
-            for q in range(n_rqpts):
-                rfreqs[q], reigenvecs[q], sfreqs, sevecs, si = \
-                self._calculate_phonons_at_q(q, q_independent_args)
-                if len(sfreqs) > 0:
-                    split_i = np.concatenate((split_i, si))
-                    split_freqs = np.concatenate((split_freqs, sfreqs))
-                    split_eigenvecs = np.concatenate(
-                        (split_eigenvecs, sevecs))
+            dyn_mat_args = (
+                self._get_fc_img_upper(fc_img_attr, dtype),
+                unique_sc_offsets, unique_sc_i,
+                unique_cell_origins, unique_cell_i, recip_asr_correction,
+                dipole, asr, dtype)
+            # Calculate the dynamical matrices for a chunk of q-points at
+            # once and diagonalise them all in a single batched call to avoid
+            # the per-matrix LAPACK dispatch overhead. The largest
+            # temporaries are (chunk, n_cells_in_sc, n_ions, n_ions) complex
+            # arrays, so size the chunk to keep these to ~1e6 elements
+            n_cells_in_sc = len(fc_img_weighted)
+            chunk = max(1, min(100, int(1e6/(n_cells_in_sc*n_ions**2))))
+            # If splitting, gamma points are calculated in a separate pass
+            # below, so leave them out here to avoid calculating them twice
+            if splitting:
+                calc_qi = np.where(np.logical_not(is_gamma(reduced_qpts)))[0]
+            else:
+                calc_qi = np.arange(n_rqpts)
+            for qi in range(0, len(calc_qi), chunk):
+                chunk_qi = calc_qi[qi:qi + chunk]
+                dyn_mats = self._calculate_corrected_dyn_mats(
+                    reduced_qpts[chunk_qi], dyn_mat_args)
+                dyn_mats *= dyn_mat_weighting
+                freqs, evecs = self._diagonalise_dyn_mats(
+                    dyn_mats, calc_eigenvecs=calc_eigenvecs)
+                rfreqs[chunk_qi] = freqs
+                if calc_eigenvecs:
+                    reigenvecs[chunk_qi] = evecs
+
+            # LO-TO splitting only affects the (usually few) gamma points, so
+            # calculate just those with the non-analytic correction
+            if splitting:
+                gamma_qi, gamma_dyn_mats, split_i, split_dyn_mats = \
+                self._calculate_gamma_dyn_mats(
+                    reduced_qpts, qpts_i, dyn_mat_args)
+                gamma_dyn_mats *= dyn_mat_weighting
+                freqs, evecs = self._diagonalise_dyn_mats(
+                    gamma_dyn_mats, calc_eigenvecs=calc_eigenvecs)
+                rfreqs[gamma_qi] = freqs
+                if calc_eigenvecs:
+                    reigenvecs[gamma_qi] = evecs
+                if len(split_i) > 0:
+                    split_dyn_mats *= dyn_mat_weighting
+                    split_freqs, split_eigenvecs = self._diagonalise_dyn_mats(
+                        split_dyn_mats, calc_eigenvecs=calc_eigenvecs)
 
         self.asr = asr
         self.dipole = dipole
@@ -428,35 +499,55 @@ class InterpolationData(PhononData):
 
         return self.freqs, self.eigenvecs
 
-    def _calculate_phonons_at_q(self, q, args):
+    def _calculate_corrected_dyn_mats(self, qpts, args):
         """
-        Given a q-point and some precalculated q-independent values, calculate
-        and diagonalise the dynamical matrix and return the frequencies and
-        eigenvalues. Optionally also includes the Ewald dipole sum correction
-        and LO-TO splitting
+        Given a stack of q-points and some precalculated q-independent values,
+        calculate the non mass weighted dynamical matrices. Optionally also
+        includes the Ewald dipole sum and reciprocal ASR corrections
         """
-        (reduced_qpts, qpts_i, fc_img_weighted, unique_sc_offsets,
-         unique_sc_i, unique_cell_origins, unique_cell_i,
-         recip_asr_correction, dyn_mat_weighting, dipole, asr,
-         splitting) = args
+        (fc_img_upper, unique_sc_offsets, unique_sc_i, unique_cell_origins,
+         unique_cell_i, recip_asr_correction, dipole, asr, dtype) = args
 
-        qpt = reduced_qpts[q]
-        n_ions = self.n_ions
-
-        dyn_mat = self._calculate_dyn_mat(
-            qpt, fc_img_weighted, unique_sc_offsets, unique_sc_i,
-            unique_cell_origins, unique_cell_i)
+        dyn_mats = self._calculate_dyn_mat(
+            qpts, fc_img_upper, unique_sc_offsets, unique_sc_i,
+            unique_cell_origins, unique_cell_i, dtype=dtype)
 
         if dipole:
-            dipole_corr = self._calculate_dipole_correction(qpt)
-            dyn_mat += dipole_corr
+            dyn_mats += self._calculate_dipole_correction(qpts)
 
         if asr == 'reciprocal':
-            dyn_mat += recip_asr_correction
+            dyn_mats += recip_asr_correction
+
+        return dyn_mats
+
+    def _calculate_gamma_dyn_mats(self, reduced_qpts, qpts_i, args):
+        """
+        Calculate the non mass weighted dynamical matrices including the
+        non-analytic LO-TO splitting correction at each gamma point. The
+        direction of approach is taken from the adjacent q-points, if a gamma
+        point is approached from 2 directions the second matrix is returned as
+        an additional split dynamical matrix
+
+        Returns
+        -------
+        gamma_qi : (n_gamma,) int ndarray
+            The indices of the gamma points in reduced_qpts
+        gamma_dyn_mats : (n_gamma, 3*n_ions, 3*n_ions) complex ndarray
+            The corrected dynamical matrix for each gamma point
+        split_i : (n_splits,) int ndarray
+            The indices in the original (non reduced) q-points of the gamma
+            points with an additional split dynamical matrix
+        split_dyn_mats : (n_splits, 3*n_ions, 3*n_ions) complex ndarray
+            The additional split dynamical matrices
+        """
+        n_ions = self.n_ions
+        gamma_qi = np.where(is_gamma(reduced_qpts))[0]
+        gamma_dyn_mats = self._calculate_corrected_dyn_mats(
+            reduced_qpts[gamma_qi], args)
 
-        # Calculate LO-TO splitting by calculating non-analytic correction
-        # to dynamical matrix
-        if splitting and is_gamma(qpt):
+        split_i = []
+        split_dyn_mats = []
+        for i, q in enumerate(gamma_qi):
             # If first q-point
             if qpts_i[0] == q:
                 q_dirs = [reduced_qpts[qpts_i[1]]]
@@ -468,60 +559,120 @@ class InterpolationData(PhononData):
                 qpos = np.where(qpts_i==q)[0][0]
                 q_dirs = [-reduced_qpts[qpts_i[qpos - 1]],
                            reduced_qpts[qpts_i[qpos + 1]]]
-            na_corrs = np.zeros((len(q_dirs), 3*n_ions, 3*n_ions),
-                                dtype=np.complex128)
-            for i, q_dir in enumerate(q_dirs):
-                na_corrs[i] = self._calculate_gamma_correction(q_dir)
-        else:
-            # Correction is zero if not a gamma point or splitting = False
-            na_corrs = np.array([0])
+            na_corrs = [self._calculate_gamma_correction(q_dir)
+                        for q_dir in q_dirs]
+            # If approached from 2 directions, the second direction gives
+            # the additional split dynamical matrix
+            if len(q_dirs) > 1:
+                split_i.append(qpos)
+                split_dyn_mats.append(gamma_dyn_mats[i] + na_corrs[1])
+            gamma_dyn_mats[i] += na_corrs[0]
+
+        split_i = np.array(split_i, dtype=np.int32)
+        split_dyn_mats = np.reshape(
+            np.array(split_dyn_mats, dtype=np.complex128),
+            (len(split_i), 3*n_ions, 3*n_ions))
+
+        return gamma_qi, gamma_dyn_mats, split_i, split_dyn_mats
+
+    def _diagonalise_dyn_mats(self, dyn_mats, calc_eigenvecs=True):
+        """
+        Diagonalise a stack of mass weighted dynamical matrices in a single
+        batched call, and convert the eigenvalues/vectors to frequencies and
+        eigenvectors
 
-        split_i = np.empty((0,), dtype=np.int32)
-        sfreqs = np.empty((0, 3*n_ions))
-        sevecs = np.empty((0, 3*n_ions, n_ions, 3))
-        for i, na_corr in enumerate(na_corrs):
-            dyn_mat_corr = dyn_mat + na_corr
-
-            # Mass weight dynamical matrix
-            dyn_mat_corr *= dyn_mat_weighting
-
-            try:
-                evals, evecs = np.linalg.eigh(dyn_mat_corr)
-            # Fall back to zheev if eigh fails (eigh calls zheevd)
-            except np.linalg.LinAlgError:
-                evals, evecs, info = zheev(dyn_mat_corr)
-            evecs = np.reshape(np.transpose(evecs),
-                               (3*n_ions, n_ions, 3))
-            # Set imaginary frequencies to negative
-            imag_freqs = np.where(evals < 0)
-            evals = np.sqrt(np.abs(evals))
-            evals[imag_freqs] *= -1
-
-            if i == 0:
-                freqs = evals
-                eigenvecs = evecs
+        Parameters
+        ----------
+        dyn_mats : (n, 3*n_ions, 3*n_ions) complex ndarray
+            The mass weighted dynamical matrices
+        calc_eigenvecs : boolean, optional, default True
+            Whether to calculate the eigenvectors, if False only the
+            eigenvalues are calculated which is faster
+
+        Returns
+        -------
+        freqs : (n, 3*n_ions) float ndarray
+            The phonon frequencies. Imaginary frequencies are negative
+        eigenvecs : (n, 3*n_ions, n_ions, 3) complex ndarray
+            The phonon eigenvectors. If calc_eigenvecs is False this is empty
+        """
+        n_ions = self.n_ions
+        try:
+            if calc_eigenvecs:
+                evals, evecs = np.linalg.eigh(dyn_mats)
             else:
-                split_i = np.concatenate((split_i, [np.where(qpts_i==q)[0][0]]))
-                sfreqs = np.concatenate((sfreqs, [evals]))
-                sevecs = np.concatenate((sevecs, [evecs]))
+                evals = np.linalg.eigvalsh(dyn_mats)
+        # If eigh fails on any matrix, diagonalise individually so zheev can
+        # be used as a fallback (eigh calls zheevd)
+        except np.linalg.LinAlgError:
+            evals = np.zeros(dyn_mats.shape[:2])
+            evecs = np.zeros(dyn_mats.shape, dtype=np.complex128)
+            for i, dyn_mat in enumerate(dyn_mats):
+                try:
+                    evals[i], evecs[i] = np.linalg.eigh(dyn_mat)
+                except np.linalg.LinAlgError:
+                    evals[i], evecs[i], info = zheev(dyn_mat)
+        if calc_eigenvecs:
+            evecs = np.reshape(np.transpose(evecs, axes=[0, 2, 1]),
+                               (len(dyn_mats), 3*n_ions, n_ions, 3))
+        else:
+            evecs = np.empty((0, 3*n_ions, n_ions, 3), dtype=np.complex128)
+        # Set imaginary frequencies to negative
+        freqs = np.sqrt(np.abs(evals))
+        freqs[evals < 0] *= -1
+
+        return freqs, evecs
+
+    def _get_fc_img_upper(self, fc_img_attr, dtype):
+        """
+        Get the 3 x 3 blocks of an image weighted force constants matrix for
+        each ij ion pair with i <= j, in the requested precision. These are
+        q-independent, so they are only gathered once and then stored for
+        each type of fc matrix and dtype
 
-        return freqs, eigenvecs, sfreqs, sevecs, split_i
+        Parameters
+        ----------
+        fc_img_attr : str
+            The name of the attribute containing the image weighted force
+            constants matrix, e.g. '_fc_img_weighted'
+        dtype : numpy dtype
+            The floating point precision of the returned blocks
 
-    def _calculate_dyn_mat(self, q, fc_img_weighted, unique_sc_offsets,
-                           unique_sc_i, unique_cell_origins, unique_cell_i):
+        Returns
+        -------
+        fc_img_upper : (n_ions*(n_ions + 1)/2, n_cells_in_sc, 3, 3) float ndarray
+            The force constants blocks for each i <= j ion pair, in the
+            order given by np.triu_indices(n_ions)
+        """
+        upper_attr = fc_img_attr + '_upper_' + np.dtype(dtype).name
+        if not hasattr(self, upper_attr):
+            n_ions = self.n_ions
+            fc_img_weighted = getattr(self, fc_img_attr)
+            fc_blocked = np.reshape(
+                fc_img_weighted, (len(fc_img_weighted), n_ions, 3, n_ions, 3))
+            iu = np.triu_indices(n_ions)
+            setattr(self, upper_attr, np.ascontiguousarray(
+                fc_blocked[:, iu[0], :, iu[1], :], dtype=dtype))
+        return getattr(self, upper_attr)
+
+    def _calculate_dyn_mat(self, q, fc_img_upper, unique_sc_offsets,
+                           unique_sc_i, unique_cell_origins, unique_cell_i,
+                           dtype=np.float64):
         """
         Calculate the non mass weighted dynamical matrix at a specified
-        q-point from the image weighted force constants matrix and the indices
-        specifying the periodic images. See eq. 1.5:
+        q-point, or for a stack of q-points at once, from the image weighted
+        force constants matrix and the indices specifying the periodic images.
+        See eq. 1.5:
         http://www.tcm.phy.cam.ac.uk/castep/Phonons_Guide/Castep_Phonons.html
 
         Parameters
         ----------
-        q : (3,) float ndarray
-            The q-point to calculate the correction for
-        fc_img_weighted : (n_cells_in_sc, 3*n_ions, 3*n_ions) float ndarray
-            The force constants matrix weighted by the number of supercell ion
-            images for each ij displacement
+        q : (3,) or (n_qpts, 3) float ndarray
+            The q-point(s) to calculate the dynamical matrix for
+        fc_img_upper : (n_ions*(n_ions + 1)/2, n_cells_in_sc, 3, 3) float ndarray
+            The 3 x 3 blocks for each i <= j ion pair of the force constants
+            matrix weighted by the number of supercell ion images, as returned
+            by _get_fc_img_upper
         unique_sc_offsets : list of lists of ints
             A list containing 3 lists of the unique supercell image offsets in
             each direction. The supercell offset is calculated by multiplying
@@ -539,16 +690,17 @@ class InterpolationData(PhononData):
         unique_sc_i : (cell_origins, 3) int ndarray
             The indices needed to reconstruct cell_origins from the unique
             values in unique_cell_origins
+        dtype : numpy dtype, optional, default np.float64
+            The floating point precision to calculate the dynamical matrix in
 
         Returns
         -------
-        dyn_mat : (3*n_ions, 3*n_ions) complex ndarray
-            The non mass weighted dynamical matrix at q
+        dyn_mat : ([n_qpts,] 3*n_ions, 3*n_ions) complex ndarray
+            The non mass weighted dynamical matrix at each q
         """
 
         n_ions = self.n_ions
         sc_image_i = self._sc_image_i
-        dyn_mat = np.zeros((n_ions*3, n_ions*3), dtype=np.complex128)
 
         # Cumulant method: for each ij ion-ion displacement sum phases for
         # all possible supercell images, then multiply by the cell phases
@@ -558,17 +710,36 @@ class InterpolationData(PhononData):
         # Make sc_phases 1 longer than necessary, so when summing phases for
         # supercell images if there is no image, an index of -1 and hence
         # phase of zero can be used
-        sc_phases = np.zeros(len(unique_sc_i) + 1, dtype=np.complex128)
-        sc_phases[:-1], cell_phases = self._calculate_phases(
+        sc_phases = np.zeros(q.shape[:-1] + (len(unique_sc_i) + 1,),
+                             dtype=np.complex128)
+        sc_phases[..., :-1], cell_phases = self._calculate_phases(
             q, unique_sc_offsets, unique_sc_i, unique_cell_origins,
             unique_cell_i)
-        sc_phase_sum = np.sum(sc_phases[sc_image_i],
-                              axis=3)
+        # Sum over images one at a time rather than indexing all images at
+        # once, to avoid a temporary that is n_images times larger
+        sc_phase_sum = sc_phases[..., sc_image_i[..., 0]]
+        for im in range(1, sc_image_i.shape[-1]):
+            sc_phase_sum += sc_phases[..., sc_image_i[..., im]]
         ax = np.newaxis
-        ij_phases = cell_phases[:, ax, ax]*sc_phase_sum
-        full_dyn_mat = fc_img_weighted*(
-            ij_phases.repeat(3, axis=2).repeat(3, axis=1))
-        dyn_mat = np.sum(full_dyn_mat, axis=0)
+        ij_phases = sc_phase_sum
+        ij_phases *= cell_phases[..., ax, ax]
+        # Use the 3 x 3 fc blocks for each ij so the phases can be broadcast
+        # over each block without repeating them. The dynamical matrix is
+        # Hermitian, so only calculate the blocks for i <= j and fill in the
+        # rest by symmetry
+        cdtype = np.result_type(dtype, np.complex64)
+        iu = np.triu_indices(n_ions)
+        dyn_mat_u = np.einsum(
+            'pcab,...cp->...pab', fc_img_upper,
+            ij_phases[..., iu[0], iu[1]].astype(cdtype, copy=False))
+        dyn_mat = np.empty(q.shape[:-1] + (n_ions, n_ions, 3, 3),
+                           dtype=cdtype)
+        # Fill lower first so the calculated i == j blocks are kept
+        dyn_mat[..., iu[1], iu[0], :, :] = np.conj(
+            np.swapaxes(dyn_mat_u, -1, -2))
+        dyn_mat[..., iu[0], iu[1], :, :] = dyn_mat_u
+        dyn_mat = np.reshape(np.swapaxes(dyn_mat, -3, -2),
+                             q.shape[:-1] + (3*n_ions, 3*n_ions))
 
         return dyn_mat
 
@@ -601,93 +772,129 @@ class InterpolationData(PhononData):
         # Use eta = lambda * |permittivity|**(1/6)
         eta = eta*np.power(np.linalg.det(dielectric), 1.0/6)*eta_scale
         eta_2 = eta**2
+        # These don't depend on q, so calculate the scale factors for the
+        # real and reciprocal space terms once and store them
+        cell_volume = np.dot(cell_vec[0], np.cross(cell_vec[1], cell_vec[2]))
+        real_scale = eta**3/math.sqrt(np.linalg.det(dielectric))
+        recip_scale = math.pi/(cell_volume*eta_2)
 
         # Set limits and tolerances
         max_shells = 50
         frac_tol = 1e-15
+        # Max. no. of cells in a shell to calculate H_ab for at once
+        cell_chunk = 64
 
         # Calculate q=0 real space term
         real_q0 = np.zeros((n_ions, n_ions, 3, 3))
         # No. of independent i, j ion entries (to use i, j symmetry to
         # minimise size of stored H_ab)
         n_elems = np.sum(range(1, n_ions + 1))
-        H_ab = np.zeros((0, n_elems, 3, 3))
-        cells = np.zeros((0, 3))
+        # Collect the terms for each shell in lists and join them once at
+        # the end, rather than reallocating the arrays for every shell
+        H_ab = [np.zeros((0, n_elems, 3, 3))]
+        cells = [np.zeros((0, 3))]
         ion_r_cart = np.einsum('ij,jk->ik', ion_r, cell_vec)
         ion_r_e = np.einsum('ij,jk->ik', ion_r_cart, inv_dielectric)
+        # Ion-ion vectors for each independent i, j (upper triangular) entry
+        idx_u = np.triu_indices(n_ions)
+        rij_cart = ion_r_cart[idx_u[0]] - ion_r_cart[idx_u[1]]
+        rij_e = ion_r_e[idx_u[0]] - ion_r_e[idx_u[1]]
+        is_diag = idx_u[0] == idx_u[1]
+        ax = np.newaxis
         for n in range(max_shells):
             cells_tmp = self._get_shell_origins(n)
             cells_cart = np.einsum('ij,jk->ik', cells_tmp, cell_vec)
             cells_e = np.einsum(
                 'ij,jk->ik', cells_cart, inv_dielectric)
-            H_ab_tmp = np.zeros((len(cells_tmp), n_elems, 3, 3))
-            for i in range(n_ions):
-                idx = np.sum(range(n_ions - i, n_ions), dtype=np.int32)
-                for j in range(i, n_ions):
-                    if n == 0 and i == j:
-                        continue
-                    rij_cart = ion_r_cart[i] - ion_r_cart[j]
-                    rij_e = ion_r_e[i] - ion_r_e[j]
-                    diffs = rij_cart - cells_cart
-                    deltas = rij_e - cells_e
-                    norms_2 = np.einsum('ij,ij->i', deltas, diffs)*eta_2
-                    norms = np.sqrt(norms_2)
-
-                    # Calculate H_ab
+            H_ab_tmp = np.empty((len(cells_tmp), n_elems, 3, 3))
+            # Calculate for all i, j entries at once, but only for a
+            # block of cells at a time to bound the size of the
+            # (n_cells, n_elems, 3, 3) temporaries in the outer shells
+            for ci in range(0, len(cells_tmp), cell_chunk):
+                cf = min(ci + cell_chunk, len(cells_tmp))
+                diffs = rij_cart[ax, :, :] - cells_cart[ci:cf, ax, :]
+                deltas = rij_e[ax, :, :] - cells_e[ci:cf, ax, :]
+                norms_2 = np.einsum('ijk,ijk->ij', deltas, diffs)*eta_2
+                norms = np.sqrt(norms_2)
+
+                # Calculate H_ab. The i == j terms in the R=0 cell have
+                # zero norm, so ignore the division errors and zero them
+                # afterwards
+                with np.errstate(divide='ignore', invalid='ignore'):
                     exp_term = 2*np.exp(-norms_2)/(sqrt_pi*norms_2)
                     erfc_term = erfc(norms)/(norms*norms_2)
-                    f1 = eta_2*(3*erfc_term/norms_2 + exp_term*(3/norms_2 + 2))
+                    f1 = eta_2*(3*erfc_term/norms_2
+                                + exp_term*(3/norms_2 + 2))
                     f2 = erfc_term + exp_term
-                    deltas_ab = np.einsum('ij,ik->ijk', deltas, deltas)
-                    H_ab_tmp[:, idx + j] = (
-                        np.einsum('i,ijk->ijk', f1, deltas_ab)
-                        - np.einsum('i,jk->ijk', f2, inv_dielectric))
+                    H_ab_chunk = H_ab_tmp[ci:cf]
+                    np.einsum('ijk,ijl->ijkl', deltas, deltas,
+                              out=H_ab_chunk)
+                    H_ab_chunk *= f1[:, :, ax, ax]
+                    H_ab_chunk -= f2[:, :, ax, ax]*inv_dielectric
+            if n == 0:
+                H_ab_tmp[:, is_diag] = 0
             # End series when current terms are less than the fractional
             # tolerance multiplied by the term for the cell at R=0
             if n == 0:
                 r0_max = np.amax(np.abs(H_ab_tmp))
             if np.amax(np.abs(H_ab_tmp)) > frac_tol*r0_max:
-                H_ab = np.concatenate((H_ab, H_ab_tmp))
-                cells = np.concatenate((cells, cells_tmp))
+                H_ab.append(H_ab_tmp)
+                cells.append(cells_tmp)
             else:
                 break
+        H_ab = np.concatenate(H_ab)
+        cells = np.concatenate(cells)
         # Use compact H_ab to fill in upper triangular of the realspace term
         real_q0[np.triu_indices(n_ions)] = np.sum(H_ab, axis=0)
-        real_q0 *= eta**3/math.sqrt(np.linalg.det(dielectric))
+        real_q0 *= real_scale
 
         # Calculate the q=0 reciprocal term
         recip_q0 = np.zeros((n_ions, n_ions, 3, 3), dtype=np.complex128)
         # Add G = 0 vectors to list, for later calculations when q !=0,
         # but don't calculate for q=0
-        gvecs_cart = np.array([[0., 0., 0.]])
-        gvec_phases = np.tile([1. + 0.j], (1, n_ions))
+        gvecs_cart = [np.array([[0., 0., 0.]])]
+        gvec_phases = [np.tile([1. + 0.j], (1, n_ions))]
         for n in range(1, max_shells):
             gvecs = self._get_shell_origins(n)
             gvecs_cart_tmp = np.einsum('ij,jk->ik', gvecs, recip)
             gvec_dot_r = np.einsum('ij,kj->ik', gvecs, ion_r)
             gvec_phases_tmp = np.exp(2j*math.pi*gvec_dot_r)
-            gvecs_ab = np.einsum('ij,ik->ijk', gvecs_cart_tmp, gvecs_cart_tmp)
-            k_len_2 = np.einsum('ijk,jk->i', gvecs_ab, dielectric)/(4*eta_2)
-            recip_exp = np.exp(-k_len_2)/k_len_2
-            recip_q0_tmp = np.zeros((n_ions, n_ions, 3, 3),
-                                    dtype=np.complex128)
-            for i in range(n_ions):
-                for j in range(i, n_ions):
-                    phase_exp = gvec_phases_tmp[:, i]/gvec_phases_tmp[:, j]
-                    recip_q0_tmp[i, j] = np.einsum(
-                        'ijk,i,i->jk', gvecs_ab, phase_exp, recip_exp)
+            k_len_2 = np.sum(np.dot(gvecs_cart_tmp, dielectric)
+                             *gvecs_cart_tmp, axis=1)/(4*eta_2)
+            recip_exp = np.einsum('ij,ik->ijk', gvecs_cart_tmp,
+                                  gvecs_cart_tmp)
+            recip_exp *= (np.exp(-k_len_2)/k_len_2)[:, np.newaxis, np.newaxis]
+            recip_q0_tmp = self._calculate_recip_phase_sum(
+                recip_exp, gvec_phases_tmp)
             # End series when current terms are less than the fractional
             # tolerance multiplied by the max term for the first shell
             if n == 1:
                 first_shell_max = np.amax(np.abs(recip_q0_tmp))
+                first_shell_recip_max = np.amax(np.abs(recip_exp))
             if np.amax(np.abs(recip_q0_tmp)) > frac_tol*first_shell_max:
-                gvecs_cart = np.concatenate((gvecs_cart, gvecs_cart_tmp))
-                gvec_phases = np.concatenate((gvec_phases, gvec_phases_tmp))
+                gvecs_cart.append(gvecs_cart_tmp)
+                gvec_phases.append(gvec_phases_tmp)
                 recip_q0 += recip_q0_tmp
             else:
                 break
-        cell_volume = np.dot(cell_vec[0], np.cross(cell_vec[1], cell_vec[2]))
-        recip_q0 *= math.pi/(cell_volume*eta_2)
+        gvecs_cart = np.concatenate(gvecs_cart)
+        gvec_phases = np.concatenate(gvec_phases)
+        recip_q0 *= recip_scale
+
+        # The shells are cubic, so many G-vectors in the outer shells are
+        # too far from the origin to contribute for any q. Normalised q
+        # has |q| <= q_max, so |G + q| >= |G| - q_max, giving an upper
+        # bound on each G-vector's reciprocal term. Remove those that
+        # can't exceed the fractional tolerance, but always keep G = 0
+        q_corners = self._get_all_origins([2, 2, 2]) - 0.5
+        q_max = np.amax(np.linalg.norm(np.dot(q_corners, recip), axis=1))
+        eps_min = np.amin(np.linalg.eigvalsh(dielectric))
+        k_min = np.maximum(np.linalg.norm(gvecs_cart, axis=1) - q_max, 0)
+        recip_bound = (4*eta_2/eps_min)*np.exp(-eps_min*k_min**2/(4*eta_2))
+        keep_gvecs = recip_bound > frac_tol*first_shell_recip_max
+        keep_gvecs[0] = True
+        gvecs_cart = gvecs_cart[keep_gvecs]
+        gvec_phases = gvec_phases[keep_gvecs]
 
         # Fill in remaining entries by symmetry
         for i in range(1, n_ions):
@@ -710,11 +917,19 @@ class InterpolationData(PhononData):
 
         self._eta_scale = eta_scale
         self._eta = eta
+        self._cell_volume = cell_volume
+        self._real_dipole_scale = real_scale
+        self._recip_dipole_scale = recip_scale
         self._H_ab = H_ab
         self._cells = cells
         self._gvecs_cart = gvecs_cart
         self._gvec_phases = gvec_phases
         self._dipole_q0 = dipole_q0
+        # Contraction path for multiplying the dipole tensor by the Born
+        # charges, this only depends on n_ions so can be reused for every q
+        self._born_path = np.einsum_path(
+            'iap,...ikpm,klm->...iakl', born, real_q0, born,
+            optimize='greedy')[0]
 
 
     def _calculate_dipole_correction(self, q):
@@ -724,15 +939,15 @@ class InterpolationData(PhononData):
 
         Parameters
         ----------
-        q : (3,) float ndarray
-            The q-point to calculate the correction for
+        q : (3,) or (n_qpts, 3) float ndarray
+            The q-point(s) to calculate the correction for
 
         Returns
         -------
-        corr : (3*n_ions, 3*n_ions) complex ndarray
-            The correction to the dynamical matrix
+        corr : (3*n_ions, 3*n_ions) or (n_qpts, 3*n_ions, 3*n_ions)
+               complex ndarray
+            The correction to the dynamical matrix (or matrices)
         """
-        cell_vec = self._cell_vec
         recip = self._recip_vec
         n_ions = self.n_ions
         ion_r = self.ion_r
@@ -742,63 +957,105 @@ class InterpolationData(PhononData):
         eta_2 = eta**2
         H_ab = self._H_ab
         cells = self._cells
-        q_norm = q - np.rint(q)  # Normalised q-pt
-
-        # Don't include G=0 vector if q=0
-        if is_gamma(q_norm):
-            gvec_phases = self._gvec_phases[1:]
-            gvecs_cart = self._gvecs_cart[1:]
-        else:
-            gvec_phases = self._gvec_phases
-            gvecs_cart = self._gvecs_cart
+        gvec_phases = self._gvec_phases
+        gvecs_cart = self._gvecs_cart
+        ax = np.newaxis
+        # Calculate for a stack of normalised q-points
+        q = np.asarray(q)
+        q_norm = np.reshape(q - np.rint(q), (-1, 3))
+        n_qpts = len(q_norm)
 
         # Calculate real space term
-        real_dipole = np.zeros((n_ions, n_ions, 3, 3), dtype=np.complex128)
+        real_dipole = np.zeros((n_qpts, n_ions, n_ions, 3, 3),
+                               dtype=np.complex128)
         # Calculate real space phase factor
-        q_dot_ra = np.einsum('i,ji->j', q_norm, cells)
-        real_phases = np.exp(2j*math.pi*q_dot_ra)
-        real_dipole_tmp = np.einsum('i,ijkl->jkl', real_phases, H_ab)
+        q_dot_ra = 2*math.pi*np.einsum('ij,kj->ik', q_norm, cells)
+        # H_ab is real, so sum the real and imaginary parts of the phases
+        # separately with a real matrix product, rather than converting
+        # H_ab to complex for every q
+        real_phases = np.concatenate((np.cos(q_dot_ra), np.sin(q_dot_ra)))
+        real_dipole_ri = np.matmul(
+            real_phases, np.reshape(H_ab, (len(H_ab), -1)))
+        real_dipole_tmp = np.reshape(
+            real_dipole_ri[:n_qpts] + 1j*real_dipole_ri[n_qpts:],
+            (n_qpts,) + H_ab.shape[1:])
         idx_u = np.triu_indices(n_ions)
-        real_dipole[idx_u] = real_dipole_tmp
-        real_dipole *= eta**3/math.sqrt(np.linalg.det(dielectric))
+        real_dipole[:, idx_u[0], idx_u[1]] = real_dipole_tmp
+        real_dipole *= self._real_dipole_scale
 
         # Calculate reciprocal term
-        recip_dipole = np.zeros((n_ions, n_ions, 3, 3), dtype=np.complex128)
         # Calculate q-point phases
-        q_dot_r = np.einsum('i,ji->j', q_norm, ion_r)
+        q_dot_r = np.einsum('ij,kj->ik', q_norm, ion_r)
         q_phases = np.exp(2j*math.pi*q_dot_r)
         q_cart = np.dot(q_norm, recip)
         # Calculate k-vector symmetric matrix
-        kvecs = gvecs_cart + q_cart
-        kvecs_ab = np.einsum('ij,ik->ijk', kvecs, kvecs)
-        k_len_2 = np.einsum('ijk,jk->i', kvecs_ab, dielectric)/(4*eta_2)
-        recip_exp = np.einsum('ijk,i->ijk', kvecs_ab, np.exp(-k_len_2)/k_len_2)
-        for i in range(n_ions):
-                phase_exp = ((gvec_phases[:, i, None]*q_phases[i])
-                             /(gvec_phases[:, i:]*q_phases[i:]))
-                recip_dipole[i, i:] = np.einsum(
-                    'ikl,ij->jkl', recip_exp, phase_exp)
-        cell_volume = np.dot(cell_vec[0], np.cross(cell_vec[1], cell_vec[2]))
-        recip_dipole *= math.pi/(cell_volume*eta_2)
+        kvecs = gvecs_cart[ax, :, :] + q_cart[:, ax, :]
+        # Calculate k.dielectric.k directly from kvecs, and scale the
+        # symmetric matrix in place, to avoid extra (n_kvecs, 3, 3) arrays
+        k_len_2 = np.sum(np.dot(kvecs, dielectric)*kvecs, axis=-1)/(4*eta_2)
+        # Don't include G=0 vector if q=0. G=0 is the first G-vector, and
+        # is the only one that can have zero length
+        with np.errstate(divide='ignore', invalid='ignore'):
+            recip_weight = np.exp(-k_len_2)/k_len_2
+        recip_weight[is_gamma(q_norm), 0] = 0
+        recip_exp = np.einsum('ijk,ijl->ijkl', kvecs, kvecs)
+        recip_exp *= recip_weight[:, :, ax, ax]
+        # Calculate all i, j entries at once, the result is Hermitian so
+        # doesn't need filling in by symmetry. The q-point phase
+        # difference doesn't depend on G so is applied afterwards
+        recip_dipole = np.zeros((n_qpts, n_ions, n_ions, 3, 3),
+                                dtype=np.complex128)
+        for qi in range(n_qpts):
+            recip_dipole[qi] = self._calculate_recip_phase_sum(
+                recip_exp[qi], gvec_phases)
+        q_phase_diffs = q_phases[:, :, ax]*np.conj(q_phases[:, ax, :])
+        recip_dipole *= q_phase_diffs[:, :, :, ax, ax]
+        recip_dipole *= self._recip_dipole_scale
 
         # Fill in remaining entries by symmetry
         # Mask so we don't count diagonal twice
-        mask = np.tri(n_ions, k=-1)[:, :, np.newaxis, np.newaxis]
-        real_dipole = real_dipole + mask*np.conj(
-            np.transpose(real_dipole, axes=[1, 0, 2, 3]))
-        recip_dipole = recip_dipole + mask*np.conj(
-            np.transpose(recip_dipole, axes=[1, 0, 2, 3]))
-
-        # Multiply by Born charges and subtract q=0 from diagonal
-        dipole = np.zeros((n_ions, n_ions, 3, 3), dtype=np.complex128)
+        mask = np.tri(n_ions, k=-1)[:, :, ax, ax]
+        real_dipole += mask*np.conj(
+            np.transpose(real_dipole, axes=[0, 2, 1, 3, 4]))
+
+        # Multiply by Born charges and subtract q=0 from diagonal. The
+        # output is ordered (q, i, a, j, b) so it can be reshaped directly
         dipole_tmp = recip_dipole - real_dipole
-        for i in range(n_ions):
-            dipole[i] = np.einsum('ij,klm,kjm->kil',
-                                  born[i], born, dipole_tmp[i])
-            dipole[i, i] -= self._dipole_q0[i]
+        dipole = np.einsum('iap,...ikpm,klm->...iakl', born, dipole_tmp,
+                           born, optimize=self._born_path)
+        idx = np.arange(n_ions)
+        # The advanced indices are separated, so the ion axis comes first
+        dipole[:, idx, :, idx, :] -= self._dipole_q0[:, ax]
+
+        return np.reshape(dipole, q.shape[:-1] + (3*n_ions, 3*n_ions))
 
-        return np.reshape(np.transpose(dipole, axes=[0, 2, 1, 3]),
-                          (3*n_ions, 3*n_ions))
+    def _calculate_recip_phase_sum(self, recip_exp, phases):
+        """
+        Sum a reciprocal space term over G-vectors for every pair of ions,
+        weighted by the phase difference between the ions
+
+        Parameters
+        ----------
+        recip_exp : (n_gvecs, 3, 3) float ndarray
+            The reciprocal space term for each G-vector
+        phases : (n_gvecs, n_ions) complex ndarray
+            The phase of each ion for each G-vector. These have unit
+            magnitude, so the phase difference between ions i and j is
+            phases[:, i]*conj(phases[:, j])
+
+        Returns
+        -------
+        recip_sum : (n_ions, n_ions, 3, 3) complex ndarray
+            The summed term for each ion pair
+        """
+        n_gvecs, n_ions = phases.shape
+        # Sum over G-vectors as a single matrix product, rather than
+        # looping over ion pairs
+        recip_exp_j = np.conj(phases)[:, :, np.newaxis]*np.reshape(
+            recip_exp, (n_gvecs, 1, 9))
+        recip_sum = np.matmul(np.transpose(phases),
+                              np.reshape(recip_exp_j, (n_gvecs, 9*n_ions)))
+        return np.reshape(recip_sum, (n_ions, n_ions, 3, 3))
 
     def _calculate_gamma_correction(self, q_dir):
         """
@@ -817,22 +1074,17 @@ class InterpolationData(PhononData):
         na_corr : (3*n_ions, 3*n_ions) complex ndarray
             The correction to the dynamical matrix
         """
-        cell_vec = self._cell_vec
-        n_ions = self.n_ions
         born = self._born
         dielectric = self.dielectric
 
-        cell_volume = np.dot(cell_vec[0], np.cross(cell_vec[1], cell_vec[2]))
+        cell_volume = self._cell_volume
         denominator = np.einsum('ij,i,j', dielectric, q_dir, q_dir)
         factor = 4*math.pi/(cell_volume*denominator)
 
-        q_born_sum = np.einsum('ijk,k->ij', born, q_dir)
-        na_corr = np.zeros((3*n_ions, 3*n_ions), dtype=np.complex128)
-        for i in range(n_ions):
-            for j in range(n_ions):
-                na_corr[3*i:3*(i+1), 3*j:3*(j+1)] = np.einsum(
-                    'i,j->ij', q_born_sum[i], q_born_sum[j])
-        na_corr *= factor
+        # Flattening the (n_ions, 3) sums gives the (3*n_ions, 3*n_ions)
+        # layout directly from a single outer product
+        q_born_sum = np.einsum('ijk,k->ij', born, q_dir).flatten()
+        na_corr = np.outer(factor*q_born_sum, q_born_sum).astype(np.complex128)
 
         return na_corr
 
@@ -899,13 +1151,10 @@ class InterpolationData(PhononData):
         origins : (prod(max_xyz - min_xyz)/step, 3) int ndarray
             The cell origins
         """
-        diff = np.absolute(np.subtract(max_xyz, min_xyz))
-        nx = np.repeat(range(min_xyz[0], max_xyz[0], step), diff[1]*diff[2])
-        ny = np.repeat(np.tile(range(min_xyz[1], max_xyz[1], step), diff[0]),
-                       diff[2])
-        nz = np.tile(range(min_xyz[2], max_xyz[2], step), diff[0]*diff[1])
-
-        return np.column_stack((nx, ny, nz))
+        # Use ij indexing so x varies slowest and z fastest
+        ranges = [np.arange(min_xyz[i], max_xyz[i], step) for i in range(3)]
+        return np.stack(np.meshgrid(*ranges, indexing='ij'),
+                        axis=-1).reshape(-1, 3)
 
     def _enforce_realspace_asr(self):
         """
@@ -932,39 +1181,29 @@ class InterpolationData(PhononData):
         sq_fc = np.zeros((3*n_ions_in_sc, 3*n_ions_in_sc))
         inv_sc_matrix = np.linalg.inv(np.transpose(sc_matrix))
         cell_origins_sc = np.einsum('ij,kj->ik', cell_origins, inv_sc_matrix)
-        for nc in range(n_cells_in_sc):
-            # Get all possible cell-cell vector combinations
-            inter_cell_vectors = cell_origins_sc - np.tile(cell_origins_sc[nc],
-                                                           (n_cells_in_sc, 1))
-            # Compare cell-cell vectors with origin-cell vectors and determine
-            # which are equivalent
-            # Do calculation in chunks, so loop can be broken if all
-            # equivalent vectors have been found
-            N = 100
-            dist_min = np.full((n_cells_in_sc), sys.float_info.max)
-            sc_relative_index = np.zeros(n_cells_in_sc, dtype=np.int32)
-            for i in range(int((n_cells_in_sc - 1)/N) + 1):
-                ci = i*N
-                cf = min((i + 1)*N, n_cells_in_sc)
-                dist = (inter_cell_vectors[:, ax, :] -
-                        cell_origins_sc[ax, ci:cf, :])
-                dist_frac = dist - np.rint(dist)
-                dist_frac_sum = np.sum(np.abs(dist_frac), axis=2)
-                scri_current = np.argmin(dist_frac_sum, axis=1)
-                dist_min_current = dist_frac_sum[
-                    range(n_cells_in_sc), scri_current]
-                replace = dist_min_current < dist_min
-                sc_relative_index[replace] = ci + scri_current[replace]
-                dist_min[replace] = dist_min_current[replace]
-                if np.all(dist_min <= 16*sys.float_info.epsilon):
-                    break
+        # For each cell nc, find the index of the cell equivalent to each
+        # cell-cell vector. Compare all cell-cell vectors with all
+        # origin-cell vectors at once, in blocks of nc to limit memory
+        N = max(1, int(1e6/n_cells_in_sc**2))
+        sc_relative_index = np.zeros((n_cells_in_sc, n_cells_in_sc),
+                                     dtype=np.int32)
+        for ci in range(0, n_cells_in_sc, N):
+            cf = min(ci + N, n_cells_in_sc)
+            inter_cell_vectors = (cell_origins_sc[ax, :, :]
+                                  - cell_origins_sc[ci:cf, ax, :])
+            dist = (inter_cell_vectors[:, :, ax, :]
+                    - cell_origins_sc[ax, ax, :, :])
+            dist_frac_sum = np.sum(np.abs(dist - np.rint(dist)), axis=3)
+            sc_relative_index[ci:cf] = np.argmin(dist_frac_sum, axis=2)
+            dist_min = np.amin(dist_frac_sum, axis=2)
             if (np.any(dist_min > 16*sys.float_info.epsilon)):
                 warnings.warn(('Error correcting FC matrix for acoustic sum '
                                'rule, supercell relative index couldn\'t be '
                                'found. Returning uncorrected FC matrix'))
                 return self.force_constants
+        for nc in range(n_cells_in_sc):
             sq_fc[3*nc*n_ions:3*(nc+1)*n_ions, :] = np.transpose(
-                np.reshape(force_constants[sc_relative_index],
+                np.reshape(force_constants[sc_relative_index[nc]],
                            (3*n_cells_in_sc*n_ions, 3*n_ions)))
         try:
             ac_i, evals, evecs = self._find_acoustic_modes(sq_fc)
@@ -976,9 +1215,10 @@ class InterpolationData(PhononData):
 
         # Correct force constant matrix - set acoustic modes to almost zero
         fc_tol = 1e-8*np.min(np.abs(evals))
-        for ac in ac_i:
-            sq_fc -= (fc_tol + evals[ac])*np.einsum(
-                'i,j->ij', evecs[:, ac], evecs[:, ac])
+        # Subtract all 3 acoustic mode projections as one matrix product
+        ac_evecs = evecs[:, ac_i]
+        sq_fc -= np.matmul(ac_evecs*(fc_tol + evals[ac_i]),
+                           np.transpose(ac_evecs))
 
         fc = np.reshape(sq_fc[:, :3*n_ions],
                         (n_cells_in_sc, 3*n_ions, 3*n_ions))
@@ -1017,11 +1257,10 @@ class InterpolationData(PhononData):
                            'correcting dynamical matrix'), stacklevel=2)
             return np.array([], dtype=np.complex128)
 
-        recip_asr_correction = np.zeros((3*self.n_ions, 3*self.n_ions),
-                                        dtype=np.complex128)
-        for i, ac in enumerate(ac_i):
-            recip_asr_correction -= (tol*i + g_evals[ac])*np.einsum(
-                'i,j->ij', g_evecs[:, ac], g_evecs[:, ac])
+        ac_evecs = g_evecs[:, ac_i]
+        recip_asr_correction = -np.matmul(
+            ac_evecs*(tol*np.arange(len(ac_i)) + g_evals[ac_i]),
+            np.transpose(ac_evecs)).astype(np.complex128, copy=False)
 
         return recip_asr_correction
 
@@ -1068,13 +1307,14 @@ class InterpolationData(PhononData):
                           unique_cell_origins, unique_cell_i):
         """
         Calculate the phase factors for the supercell images and cells for a
-        single q-point. The unique supercell and cell origins indices are
-        required to minimise expensive exp and power operations
+        single q-point, or for a stack of q-points at once. The unique
+        supercell and cell origins indices are required to minimise expensive
+        exp and power operations
 
         Parameters
         ----------
-        q : (3,) float ndarray
-            The q-point to calculate the phase for
+        q : (3,) or (n_qpts, 3) float ndarray
+            The q-point(s) to calculate the phase for
         unique_sc_offsets : list of lists of ints
             A list containing 3 lists of the unique supercell image offsets in
             each direction. The supercell offset is calculated by multiplying
@@ -1095,10 +1335,10 @@ class InterpolationData(PhononData):
 
         Returns
         -------
-        sc_phases : (unique_sc_i,) float ndarray
+        sc_phases : (unique_sc_i,) or (n_qpts, unique_sc_i) float ndarray
             Phase factors exp(iq.r) for each supercell image coordinate in
             sc_offsets
-        cell_phases : (unique_cell_i,) float ndarray
+        cell_phases : (unique_cell_i,) or (n_qpts, unique_cell_i) float ndarray
             Phase factors exp(iq.r) for each cell coordinate in the supercell
         """
 
@@ -1107,15 +1347,19 @@ class InterpolationData(PhononData):
         # calculations
         # exp(iq.r) = exp(iqh.ra)*exp(iqk.rb)*exp(iql.rc)
         #           = (exp(iqh)^ra)*(exp(iqk)^rb)*(exp(iql)^rc)
-        phase = np.exp(2j*math.pi*q)
-        sc_phases = np.ones(len(unique_sc_i), dtype=np.complex128)
-        cell_phases = np.ones(len(unique_cell_i), dtype=np.complex128)
+        phase = np.exp(2j*math.pi*np.asarray(q))
+        sc_phases = np.ones(phase.shape[:-1] + (len(unique_sc_i),),
+                            dtype=np.complex128)
+        cell_phases = np.ones(phase.shape[:-1] + (len(unique_cell_i),),
+                              dtype=np.complex128)
         for i in range(3):
-            unique_sc_phases = np.power(phase[i], unique_sc_offsets[i])
-            sc_phases *= unique_sc_phases[unique_sc_i[:, i]]
+            unique_sc_phases = np.power(phase[..., i, np.newaxis],
+                                        unique_sc_offsets[i])
+            sc_phases *= unique_sc_phases[..., unique_sc_i[:, i]]
 
-            unique_cell_phases = np.power(phase[i], unique_cell_origins[i])
-            cell_phases *= unique_cell_phases[unique_cell_i[:, i]]
+            unique_cell_phases = np.power(phase[..., i, np.newaxis],
+                                          unique_cell_origins[i])
+            cell_phases *= unique_cell_phases[..., unique_cell_i[:, i]]
 
         return sc_phases, cell_phases
 
@@ -1166,48 +1410,37 @@ class InterpolationData(PhononData):
                              -1, dtype=np.int32)
         n_sc_images = np.zeros((n_cells_in_sc, n_ions, n_ions), dtype=np.int32)
 
-        # Ordering of loops here is for efficiency:
-        # ions in unit cell -> periodic supercell images -> WS points
-        # This is so the ion-ion vectors in each loop will be similar,
-        # so they are more likely to pass/fail the WS check together
-        # so the last loop can be broken early
+        # The projection of each ion-ion vector onto the WS points is
+        # linear, so project the vectors within the supercell and the
+        # supercell image origins separately, then combine them for all
+        # supercell images at once
+        image_ws = np.einsum('ij,kj->ik', sc_image_cart, ws_list_norm)
         for i in range(n_ions):
             rij = sc_ion_cart[0, i] - sc_ion_cart
-            for im, sc_r in enumerate(sc_image_cart):
-                # Get vector between j in supercell image and i in unit cell
-                dists = rij - sc_r
-                # Only want to include images where ion < halfway to ALL ws
-                # points, so compare vector to all ws points
-                for n, wsp in enumerate(ws_list_norm):
-                    dist_wsp = np.absolute(np.sum(dists*wsp, axis=-1))
-                    if n == 0:
-                        nc_idx, nj_idx = np.where(
-                            dist_wsp <= ((0.5*cutoff_scale + 0.001)))
-                        # Reindex dists to remove elements where the ion is
-                        # > halfway to WS point, to avoid wasted computation
-                        dists = dists[nc_idx, nj_idx]
-                    else:
-                        # After first reindex, dists is now 1D so need to
-                        # reindex like this instead
-                        idx = np.where(
-                            dist_wsp <= ((0.5*cutoff_scale + 0.001)))[0]
-                        nc_idx = nc_idx[idx]
-                        nj_idx = nj_idx[idx]
-                        dists = dists[idx]
-                    if len(nc_idx) == 0:
-                        break
-                    # If ion-ion vector has been < halfway to all WS points,
-                    # this is a valid image! Save it
-                    if n == len(ws_list_norm) - 1:
-                        n_im_idx = n_sc_images[nc_idx, i, nj_idx]
-                        sc_image_i[nc_idx, i, nj_idx, n_im_idx] = im
-                        n_sc_images[nc_idx, i, nj_idx] += 1
+            rij_ws = np.einsum('ijk,lk->ijl', rij, ws_list_norm)
+            # Only want to include images where ion < halfway to ALL ws
+            # points, so compare vector to each ws point in turn
+            is_image = np.ones((n_cells_in_sc, n_ions, len(image_ws)),
+                               dtype=bool)
+            for n in range(len(ws_list_norm)):
+                is_image &= (np.absolute(
+                    rij_ws[:, :, ax, n] - image_ws[ax, ax, :, n])
+                    <= (0.5*cutoff_scale + 0.001))
+            # Save the valid images for each cell and ion j, in order of
+            # increasing image index
+            n_sc_images[:, i, :] = np.sum(is_image, axis=-1)
+            n_im_idx = np.cumsum(is_image, axis=-1) - 1
+            nc_idx, nj_idx, image_idx = np.nonzero(is_image)
+            sc_image_i[nc_idx, i, nj_idx,
+                       n_im_idx[nc_idx, nj_idx, image_idx]] = image_idx
 
         self._n_sc_images = n_sc_images
         # Truncate sc_image_i to the maximum ACTUAL images rather than the
         # maximum possible images to avoid storing and summing over
-        # nonexistent images
-        self._sc_image_i = sc_image_i[:, :, :, :np.max(n_sc_images)]
+        # nonexistent images. Copy so the truncated array is contiguous for
+        # the indexing in _calculate_dyn_mat
+        self._sc_image_i = np.ascontiguousarray(
+            sc_image_i[:, :, :, :np.max(n_sc_images)])
 
     def reorder_freqs(self, **kwargs):
         """
@@ -1230,6 +1463,11 @@ class InterpolationData(PhononData):
             raise Exception((
                 'No frequencies in InterpolationData object, call '
                 'calculate_fine_phonons before reordering frequencies'))
+        if len(self._reduced_eigenvecs) == 0:
+            raise Exception((
+                'No eigenvectors in InterpolationData object, call '
+                'calculate_fine_phonons with calc_eigenvecs=True before '
+                'reordering frequencies'))
         super(InterpolationData, self).reorder_freqs(**kwargs)
 
     def calculate_structure_factor(self, scattering_lengths, **kwargs):
@@ -1254,6 +1492,15 @@ class InterpolationData(PhononData):
             A PhononData or InterpolationData object with
             frequencies/eigenvectors calculated on a q-grid over which the
             Debye-Waller factor will be calculated
+        dtype : numpy dtype, optional, default np.float64
+            The floating point precision to use for the calculation. Using
+            np.float32 halves the memory traffic and is typically faster, at
+            the cost of an error of up to ~1e-5 relative to the largest
+            structure factor
+        n_threads : int, optional, default 1
+            The number of threads to use when calculating the Debye-Waller
+            factor over the q-points in dw_data. Only applicable if dw_data
+            is given
 
         Returns
         -------
@@ -1265,12 +1512,17 @@ class InterpolationData(PhononData):
                 'No frequencies in InterpolationData object, call '
                 'calculate_fine_phonons before calling '
                 'calculate_structure_factor'))
+        if len(self._reduced_eigenvecs) == 0:
+            raise Exception((
+                'No eigenvectors in InterpolationData object, call '
+                'calculate_fine_phonons with calc_eigenvecs=True before '
+                'calling calculate_structure_factor'))
         sf = super(InterpolationData, self).calculate_structure_factor(
             scattering_lengths, **kwargs)
 
         return sf
 
-    def _dw_coeff(self, T):
+    def _dw_coeff(self, T, dtype=np.float64, n_threads=1):
         """
         Calculate the 3 x 3 Debye-Waller coefficients for each ion over the
         q-points contained in this object
@@ -1279,6 +1531,10 @@ class InterpolationData(PhononData):
         ----------
         T : float
             Temperature in Kelvin
+        dtype : numpy dtype, optional, default np.float64
+            The floating point precision to use for the calculation
+        n_threads : int, optional, default 1
+            The number of threads to use when looping over chunks of q-points
 
         Returns
         -------
@@ -1290,7 +1546,14 @@ class InterpolationData(PhononData):
                 'No frequencies in InterpolationData object, call '
                 'calculate_fine_phonons before using object as a dw_data '
                 'keyword argument to calculate_structure_factor'))
-        dw = super(InterpolationData, self)._dw_coeff(T)
+        if len(self._reduced_eigenvecs) == 0:
+            raise Exception((
+                'No eigenvectors in InterpolationData object, call '
+                'calculate_fine_phonons with calc_eigenvecs=True before '
+                'using object as a dw_data keyword argument to '
+                'calculate_structure_factor'))
+        dw = super(InterpolationData, self)._dw_coeff(T, dtype=dtype,
+                                                      n_threads=n_threads)
 
         return dw
 
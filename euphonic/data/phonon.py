@@ -1,7 +1,9 @@
 import math
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from euphonic import ureg
-from euphonic.util import direction_changed, bose_factor, is_gamma
+from euphonic.util import (direction_changed, bose_factor, is_gamma, _KB,
+                           _FM_TO_BOHR)
 from euphonic.data.data import Data
 from euphonic._readers import _castep
 
@@ -229,7 +231,8 @@ class PhononData(Data):
         self._mode_map = mode_map
 
     def calculate_structure_factor(self, scattering_lengths, T=5.0, scale=1.0,
-                                   calc_bose=True, dw_data=None):
+                                   calc_bose=True, dw_data=None,
+                                   dtype=np.float64, n_threads=1):
         """
         Calculate the one phonon inelastic scattering at each q-point
         See M. Dove Structure and Dynamics Pg. 226
@@ -251,35 +254,52 @@ class PhononData(Data):
             A PhononData or InterpolationData object with
             frequencies/eigenvectors calculated on a q-grid over which the
             Debye-Waller factor will be calculated
+        dtype : numpy dtype, optional, default np.float64
+            The floating point precision to use for the calculation. Using
+            np.float32 halves the memory traffic and is typically faster, at
+            the cost of an error of up to ~1e-5 relative to the largest
+            structure factor
+        n_threads : int, optional, default 1
+            The number of threads to use when calculating the Debye-Waller
+            factor over the q-points in dw_data. Only applicable if dw_data
+            is given
 
         Returns
         -------
         sf : (n_qpts, n_branches) float ndarray
             The structure factor for each q-point and phonon branch
         """
+        cdtype = np.result_type(dtype, np.complex64)
         sl = [scattering_lengths[x] for x in self.ion_type]
 
         # Convert units
-        recip = self._recip_vec
-        freqs = self._freqs
-        ion_mass = self._ion_mass
-        sl = (sl*ureg('fm').to('bohr')).magnitude
+        recip = self._recip_vec.astype(dtype, copy=False)
+        freqs = self._freqs.astype(dtype, copy=False)
+        ion_mass = self._ion_mass.astype(dtype, copy=False)
+        sl = (np.array(sl)*_FM_TO_BOHR).astype(dtype, copy=False)
+        qpts = self.qpts.astype(dtype, copy=False)
+        # The contractions below are fastest when the summed over indices
+        # are contiguous in memory, so make sure the arrays aren't strided
+        # views. This is free if they are already contiguous
+        ion_r = np.ascontiguousarray(self.ion_r, dtype=dtype)
+        eigenvecs = np.ascontiguousarray(self.eigenvecs, dtype=cdtype)
 
         # Calculate normalisation factor
         norm_factor = sl/np.sqrt(ion_mass)
 
         # Calculate the exponential factor for all ions and q-points
         # ion_r in fractional coords, so Qdotr = 2pi*qh*rx + 2pi*qk*ry...
-        exp_factor = np.exp(1J*2*math.pi*np.einsum('ij,kj->ik',
-                                                   self.qpts, self.ion_r))
+        # The exponent is purely imaginary, so calculate
+        # exp(iQ.r) = cos(Q.r) + isin(Q.r) from the real Q.r directly, and
+        # store the real and imaginary parts along the last axis
+        qdotr = 2*math.pi*(qpts @ ion_r.T)
+        exp_factor = np.empty(qdotr.shape + (2,), dtype=dtype)
+        np.cos(qdotr, out=exp_factor[..., 0])
+        np.sin(qdotr, out=exp_factor[..., 1])
 
         # Eigenvectors are in Cartesian so need to convert hkl to Cartesian by
         # computing the dot product with hkl and reciprocal lattice
-        Q = np.einsum('ij,jk->ik', self.qpts, recip)
-
-        # Calculate dot product of Q and eigenvectors for all branches, ions
-        # and q-points
-        eigenv_dot_q = np.einsum('ijkl,il->ijk', np.conj(self.eigenvecs), Q)
+        Q = qpts @ recip
 
         # Calculate Debye-Waller factors
         if dw_data:
@@ -289,25 +309,41 @@ class PhononData(Data):
                     ' object that calculate_structure_factor has been called on'
                     ' (they have a different number of ions). Is dw_data '
                     'correct?'))
-            dw = dw_data._dw_coeff(T)
-            dw_factor = np.exp(-np.einsum('jkl,ik,il->ij', dw, Q, Q)/2)
-            exp_factor *= dw_factor
-
-        # Multiply Q.eigenvector, exp factor and normalisation factor
-        term = np.einsum('ijk,ik,k->ij', eigenv_dot_q, exp_factor, norm_factor)
-
-        # Take mod squared and divide by frequency to get intensity
-        sf = np.absolute(term*np.conj(term))/np.absolute(freqs)
+            dw = dw_data._dw_coeff(T, dtype=dtype, n_threads=n_threads)
+            dw_factor = np.exp(-np.einsum('jkl,ik,il->ij', dw, Q, Q,
+                                          optimize='greedy')/2)
+            exp_factor *= dw_factor[..., np.newaxis]
+
+        # Multiply Q.eigenvector, exp factor and normalisation factor over
+        # ions and Cartesian directions for all branches and q-points. Only
+        # |term|^2 is needed so avoid complex arithmetic, and instead
+        # contract the real and imaginary parts separately as real arrays:
+        # (a + ib)*conj(x) = (a.Re(x) + b.Im(x)) + i(b.Re(x) - a.Im(x))
+        exp_factor *= norm_factor[:, np.newaxis]
+        evecs_ri = eigenvecs.view(dtype).reshape(eigenvecs.shape + (2,))
+        evec_q = np.einsum('ijklc,il->ijkc', evecs_ri, Q, optimize='greedy')
+        term_re = np.einsum('ijkc,ikc->ij', evec_q, exp_factor,
+                            optimize='greedy')
+        exp_factor = np.stack((-exp_factor[..., 1], exp_factor[..., 0]),
+                              axis=-1)
+        term_im = np.einsum('ijkc,ikc->ij', evec_q, exp_factor,
+                            optimize='greedy')
+
+        # Take mod squared and divide by frequency to get intensity. Apply
+        # remaining factors in place to avoid creating more temporary arrays
+        sf = np.square(term_re)
+        sf += np.square(term_im)
+        sf /= np.absolute(freqs)
 
         # Multiply by Bose factor
         if calc_bose:
-            sf = sf*bose_factor(freqs, T)
+            sf *= bose_factor(self._freqs, T).astype(dtype, copy=False)
 
-        sf = np.real(sf*scale)
+        sf *= scale
 
         return sf
 
-    def _dw_coeff(self, T):
+    def _dw_coeff(self, T, dtype=np.float64, n_threads=1):
         """
         Calculate the 3 x 3 Debye-Waller coefficients for each ion over the
         q-points contained in this object
@@ -316,53 +352,76 @@ class PhononData(Data):
         ----------
         T : float
             Temperature in Kelvin
+        dtype : numpy dtype, optional, default np.float64
+            The floating point precision to use for the calculation
+        n_threads : int, optional, default 1
+            The number of threads to use when looping over chunks of q-points
 
         Returns
         -------
         dw : (n_ions, 3, 3) float ndarray
             The DW coefficients for each ion
         """
-
-        # Convert units
-        kB = (1*ureg.k).to('E_h/K').magnitude
-        n_ions = self.n_ions
-        ion_mass = self._ion_mass
-        freqs = self._freqs
+        if self.n_qpts == 0:
+            raise Exception((
+                'No q-points in PhononData object, cannot calculate '
+                'Debye-Waller coefficients'))
+
+        cdtype = np.result_type(dtype, np.complex64)
+        ion_mass = self._ion_mass.astype(dtype, copy=False)
+        freqs = self._freqs.astype(dtype, copy=False)
         qpts = self.qpts
-        evecs = self.eigenvecs
-        weights = self.weights
+        evecs = np.ascontiguousarray(self.eigenvecs, dtype=cdtype)
+        weights = self.weights.astype(dtype, copy=False)
 
         mass_term = 1/(2*ion_mass)
 
+        if T > 0:
+            # 1/(freqs*tanh(freqs/2kT)) = (1 + 2/(exp(freqs/kT) - 1))/freqs,
+            # which only needs one transcendental call. expm1 overflows to
+            # inf for large freqs/kT, which correctly gives a term of 1/freqs
+            beta = 1/(_KB*T)
+            with np.errstate(over='ignore'):
+                freq_term = np.expm1(freqs*beta)
+            np.divide(2, freq_term, out=freq_term)
+            freq_term += 1
+            freq_term /= freqs
+        else:
+            freq_term = 1/(freqs)
         # Determine q-points near the gamma point and mask out their acoustic
         # modes due to the potentially large 1/frequency factor
         TOL = 1e-8
         is_small_q = np.sum(np.square(qpts), axis=1) < TOL
-        freq_mask = np.ones(freqs.shape)
-        freq_mask[is_small_q, :3] = 0
-
-        if T > 0:
-            x = freqs/(2*kB*T)
-            freq_term = 1/(freqs*np.tanh(x))
-        else:
-            freq_term = 1/(freqs)
-        dw = np.zeros((n_ions, 3, 3))
-        # Calculating the e.e* term is expensive, do in chunks
+        freq_term[is_small_q, :3] = 0
+        # Combine the q-point and branch dependent terms, so the e.e* outer
+        # product only needs to be weighted once
+        qpt_branch_term = weights[:, np.newaxis]*freq_term
+        # Calculating the e.e* term is expensive, do in chunks. Each chunk
+        # contributes independently to dw and einsum releases the GIL, so
+        # the chunks can be evaluated in parallel with a thread pool
         chunk = 1000
-        for i in range(int((len(qpts) - 1)/chunk) + 1):
-            qi = i*chunk
-            qf = min((i + 1)*chunk, len(qpts))
-
-            evec_term = np.real(
-                np.einsum('ijkl,ijkm->ijklm',
-                          evecs[qi:qf],
-                          np.conj(evecs[qi:qf])))
-
-            dw += (np.einsum('i,k,ij,ij,ijklm->klm',
-                             weights[qi:qf], mass_term, freq_term[qi:qf],
-                             freq_mask[qi:qf], evec_term))
+        chunk_slices = [slice(qi, qi + chunk)
+                        for qi in range(0, len(qpts), chunk)]
+
+        def dw_args(qslice):
+            return (qpt_branch_term[qslice], evecs[qslice],
+                    np.conj(evecs[qslice]))
+        # Contraction order is the same for every chunk, so only find the
+        # optimal path once
+        dw_path = np.einsum_path('ij,ijkl,ijkm->klm',
+                                 *dw_args(chunk_slices[0]),
+                                 optimize='greedy')[0]
+
+        def dw_chunk(qslice):
+            return np.einsum('ij,ijkl,ijkm->klm', *dw_args(qslice),
+                             optimize=dw_path)
+        if n_threads == 1 or len(chunk_slices) == 1:
+            dw = sum(map(dw_chunk, chunk_slices))
+        else:
+            with ThreadPoolExecutor(max_workers=n_threads) as executor:
+                dw = sum(executor.map(dw_chunk, chunk_slices))
 
-        dw = dw/np.sum(weights)
+        dw = np.real(dw)*mass_term[:, np.newaxis, np.newaxis]/np.sum(weights)
 
         return dw
 
@@ -406,20 +465,29 @@ class PhononData(Data):
                 T = kwargs['T']
             else:
                 T = 5.0
-            p_intensity = sf*bose_factor(freqs, T)
-            n_intensity = sf*bose_factor(-freqs, T)
+            # The Bose factors for +/- frequencies only differ by the
+            # (freqs > 0) step, so only calculate the occupation term once
+            occupation = bose_factor(-np.absolute(freqs), T)
+            p_intensity = sf*(occupation + (freqs > 0))
+            n_intensity = sf*(occupation + (freqs < 0))
         else:
             p_intensity = sf
             n_intensity = sf
 
-        p_bin = np.digitize(freqs, ebins)
-        n_bin = np.digitize(-freqs, ebins)
-
-        # Sum intensities into bins
-        first_index = np.transpose(
-            np.tile(range(self.n_qpts), (self.n_branches, 1)))
-        np.add.at(sqw_map, (first_index, p_bin), p_intensity)
-        np.add.at(sqw_map, (first_index, n_bin), n_intensity)
+        # ebins are ascending, so searchsorted gives the same bin indices as
+        # np.digitize without its monotonicity checks
+        p_bin = np.searchsorted(ebins, freqs, side='right')
+        n_bin = np.searchsorted(ebins, -freqs, side='right')
+
+        # Sum intensities into bins. Use the flattened index of each
+        # (q-point, bin) pair so the binning can be done with bincount
+        first_index = np.arange(self.n_qpts)[:, np.newaxis]*sqw_map.shape[1]
+        sqw_map += np.bincount(
+            np.ravel(first_index + p_bin), weights=np.ravel(p_intensity),
+            minlength=sqw_map.size).reshape(sqw_map.shape)
+        sqw_map += np.bincount(
+            np.ravel(first_index + n_bin), weights=np.ravel(n_intensity),
+            minlength=sqw_map.size).reshape(sqw_map.shape)
         sqw_map = sqw_map[:, 1:-1]  # Exclude values outside ebin range
 
         self._sqw_ebins = ebins
@@ -4,7 +4,7 @@ import warnings
 import numpy as np
 import seekpath
 from scipy import signal
-from euphonic.util import direction_changed, reciprocal_lattice, gaussian_2d
+from euphonic.util import direction_changed, reciprocal_lattice, gaussian_1d
 
 
 def calc_abscissa(qpts, recip_latt):
@@ -229,8 +229,13 @@ def plot_sqw_map(data, vmin=None, vmax=None, ratio=None, ewidth=0, qwidth=0,
             qwidth = (qbins[1] - qbins[0])/10
         if not ewidth:
             ewidth = (ebins[1] - ebins[0])/10
-        sqw_map = signal.fftconvolve(data.sqw_map, np.transpose(
-            gaussian_2d(qbins, ebins, qwidth, ewidth)), 'same')
+        # The Gaussian is separable, so convolve along q then along energy
+        # rather than with the full 2D kernel
+        sqw_map = signal.fftconvolve(
+            data.sqw_map,
+            gaussian_1d(qbins, qwidth)[:, np.newaxis], 'same')
+        sqw_map = signal.fftconvolve(
+            sqw_map, gaussian_1d(ebins, ewidth)[np.newaxis, :], 'same')
     else:
         sqw_map = data.sqw_map
 
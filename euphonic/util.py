@@ -3,6 +3,15 @@ import numpy as np
 from euphonic import ureg
 
 
+# Unit conversion factors to atomic units, converted once here rather than on
+# every call as pint unit conversions are slow
+_KB = (1*ureg.k).to('E_h/K').magnitude
+_FM_TO_BOHR = ureg('fm').to('bohr').magnitude
+_ANGSTROM_TO_BOHR = ureg('angstrom').to('bohr').magnitude
+_AMU_TO_E_MASS = ureg('amu').to('e_mass').magnitude
+_INV_CM_TO_E_H = (1*ureg('1/cm')).to('E_h', 'spectroscopy').magnitude
+
+
 def reciprocal_lattice(unit_cell):
     """
     Calculates the reciprocal lattice from a unit cell
@@ -75,6 +84,46 @@ def lorentzian(x, gamma):
     return gamma/(2*math.pi*(np.square(x) + (gamma/2)**2))
 
 
+def gaussian_1d(bins, width, extent=6.0):
+    """
+    Calculate a 1D Gaussian probability density, sampled with approximately
+    the same spacing as the provided bins. Can be used as a convolution
+    kernel
+
+    Parameters
+    ----------
+    bins : (nbins,) float ndarray
+        Bin edges
+    width : float
+        The FWHM of the Gaussian function
+    extent : float
+        How far out to calculate the Gaussian, in standard deviations
+
+    Returns
+    -------
+    gauss : (ngauss,) float ndarray
+        Gaussian probability density. ngauss is always odd
+    """
+    bin_width = np.mean(np.diff(bins))
+
+    # Gauss FWHM = 2*sigma*sqrt(2*ln2)
+    sigma = width/(2*math.sqrt(2*math.log(2)))
+
+    # Ensure ngauss is always odd, and each bin has the same approx width as
+    # original bins
+    ngauss = int(np.ceil(2*extent*sigma/bin_width)/2)*2 + 1
+    x = np.linspace(-extent*sigma, extent*sigma, ngauss)
+
+    # Evaluate the Gaussian in place on a single buffer. The prefactor
+    # cancels out when normalising, so isn't applied
+    gauss = np.square(x)
+    gauss *= -1/(2*sigma**2)
+    np.exp(gauss, out=gauss)
+    gauss /= np.sum(gauss) # Naively normalise
+
+    return gauss
+
+
 def gaussian_2d(xbins, ybins, xwidth, ywidth, extent=6.0):
     """
     Calculate a 2D Gaussian probability density, with independent standard
@@ -95,30 +144,13 @@ def gaussian_2d(xbins, ybins, xwidth, ywidth, extent=6.0):
 
     Returns
     -------
-    gauss : (nxbins, nybins) float ndarray
+    gauss : (nybins, nxbins) float ndarray
         Gaussian probability density
     """
-    xbin_width = np.mean(np.diff(xbins))
-    ybin_width = np.mean(np.diff(ybins))
-
-    # Gauss FWHM = 2*sigma*sqrt(2*ln2)
-    xsigma = xwidth/(2*math.sqrt(2*math.log(2)))
-    ysigma = ywidth/(2*math.sqrt(2*math.log(2)))
-
-    # Ensure nbins is always odd, and each bin has the same approx width as
-    # original x/ybins
-    nxbins = int(np.ceil(2*extent*xsigma/xbin_width)/2)*2 + 1
-    nybins = int(np.ceil(2*extent*ysigma/ybin_width)/2)*2 + 1
-    x = np.linspace(-extent*xsigma, extent*xsigma, nxbins)
-    y = np.linspace(-extent*ysigma, extent*ysigma, nybins)
-
-    xgrid = np.tile(x, (len(y), 1))
-    ygrid = np.transpose(np.tile(y, (len(x), 1)))
-
-    gauss = gaussian(xgrid, xsigma)*gaussian(ygrid, ysigma)
-    gauss = gauss/np.sum(gauss) # Naively normalise
-
-    return gauss
+    # A 2D Gaussian with independent x and y is separable, so it is just the
+    # outer product of the normalised 1D Gaussians
+    return np.outer(gaussian_1d(ybins, ywidth, extent=extent),
+                    gaussian_1d(xbins, xwidth, extent=extent))
 
 
 def mp_grid(grid):
@@ -137,16 +169,12 @@ def mp_grid(grid):
     """
 
     # Monkhorst-Pack grid: ur = (2r-qr-1)/2qr where r=1,2..,qr
-    qh = np.true_divide(
-        2*(np.arange(grid[0]) + 1) - grid[0] - 1, 2*grid[0])
-    qh = np.repeat(qh, grid[1]*grid[2])
-    qk = np.true_divide(
-        2*(np.arange(grid[1]) + 1) - grid[1] - 1, 2*grid[1])
-    qk = np.tile(np.repeat(qk, grid[2]), grid[0])
-    ql = np.true_divide(
-        2*(np.arange(grid[2]) + 1) - grid[2] - 1, 2*grid[2])
-    ql = np.tile(ql, grid[0]*grid[1])
-    return np.column_stack((qh, qk, ql))
+    # Use r = 0,1..,qr-1 from mgrid, so ur = (2r-qr+1)/2qr
+    grid = np.asarray(grid)
+    r = np.mgrid[0:grid[0], 0:grid[1], 0:grid[2]].reshape(3, -1)
+    qgrid = np.true_divide(2*r - grid[:, np.newaxis] + 1,
+                           2*grid[:, np.newaxis])
+    return np.ascontiguousarray(np.transpose(qgrid))
 
 
 def bose_factor(x, T):
@@ -165,11 +193,11 @@ def bose_factor(x, T):
     bose : (n_qpts, 3*n_ions) float ndarray
         Bose factor
     """
-    kB = (1*ureg.k).to('E_h/K').magnitude
-    bose = np.zeros(x.shape)
-    bose[x > 0] = 1
     if T > 0:
-        bose = bose + 1/(np.exp(np.absolute(x)/(kB*T)) - 1)
+        bose = 1/np.expm1(np.absolute(x)/(_KB*T))
+        bose = np.where(x > 0, bose + 1, bose)
+    else:
+        bose = (x > 0).astype(np.float64)
     return bose
 
 
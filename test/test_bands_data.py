@@ -1,4 +1,5 @@
 import unittest
+from types import SimpleNamespace
 import numpy.testing as npt
 import numpy as np
 from euphonic.data.bands import BandsData
@@ -7,13 +8,14 @@ from euphonic import ureg
 
 class TestBandsDataNaH(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         # Test creation of BandsData object (which reads NaH.bands file in
         # test/data dir). BandsData object will also read extra data (ion_r
         # and ion_type) from the NaH.castep file
 
-        # Create trivial object so attributes can be assigned to it
-        expctd_data = type('', (), {})()  # Expected data
+        # Create namespace object so attributes can be assigned to it
+        expctd_data = SimpleNamespace()  # Expected data
 
         expctd_data.cell_vec = np.array(
             [[0.000000, 4.534397, 4.534397],
@@ -32,32 +34,32 @@ class TestBandsDataNaH(unittest.TestCase):
               -0.83036048, -0.05738470]])*ureg('hartree')
         expctd_data.freq_down = np.array([])*ureg('hartree')
         expctd_data.fermi = np.array([-0.009615])*ureg('hartree')
-        self.expctd_data = expctd_data
+        cls.expctd_data = expctd_data
 
         seedname = 'NaH'
         path = 'data'
         data = BandsData.from_castep(seedname, path=path)
-        self.data = data
+        cls.data = data
 
     def test_cell_vec_read_nah_bands(self):
         npt.assert_allclose(self.data.cell_vec.to('bohr').magnitude,
                             self.expctd_data.cell_vec.to('bohr').magnitude)
 
     def test_ion_r_read_nah_bands(self):
-        npt.assert_array_equal(self.data.ion_r,
-                               self.expctd_data.ion_r)
+        npt.assert_allclose(self.data.ion_r, self.expctd_data.ion_r,
+                            rtol=1e-12)
 
     def test_ion_type_read_nah_bands(self):
         npt.assert_array_equal(self.data.ion_type,
                                self.expctd_data.ion_type)
 
     def test_qpts_read_nah_bands(self):
-        npt.assert_array_equal(self.data.qpts,
-                               self.expctd_data.qpts)
+        npt.assert_allclose(self.data.qpts, self.expctd_data.qpts,
+                            rtol=1e-12)
 
     def test_weights_read_nah_bands(self):
-        npt.assert_array_equal(self.data.weights,
-                               self.expctd_data.weights)
+        npt.assert_allclose(self.data.weights, self.expctd_data.weights,
+                            rtol=1e-12)
 
     def test_freqs_read_nah_bands(self):
         npt.assert_allclose(self.data.freqs.to('hartree').magnitude,
@@ -74,13 +76,14 @@ class TestBandsDataNaH(unittest.TestCase):
 
 class TestBandsDataFe(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         # Test creation of BandsData object (which reads Fe.bands file in
         # test/data dir). There is no Fe.castep file in test/data so the ion_r
         # and ion_pos attributes shouldn't exist
 
-        # Create trivial function object so attributes can be assigned to it
-        expctd_data = type('', (), {})()  # Expected data
+        # Create namespace object so attributes can be assigned to it
+        expctd_data = SimpleNamespace()  # Expected data
 
         expctd_data.cell_vec = np.array(
             [[-2.708355, 2.708355, 2.708355],
@@ -100,17 +103,18 @@ class TestBandsDataFe(unittest.TestCase):
               0.22763689, 0.24912308, 0.46511567],
              [0.08778721, 0.08033338, 0.19288937,
               0.21817779, 0.24476910, 0.39214129]])*ureg('hartree')
-        expctd_data.fermi = [0.173319, 0.173319]*ureg('hartree')
-        self.expctd_data = expctd_data
+        expctd_data.fermi = np.array([0.173319, 0.173319])*ureg('hartree')
+        cls.expctd_data = expctd_data
 
         seedname = 'Fe'
         path = 'data'
         data = BandsData.from_castep(seedname, path=path)
-        self.data = data
+        cls.data = data
 
     def test_cell_vec_read_fe_bands(self):
-        npt.assert_array_equal(self.data.cell_vec.to('bohr').magnitude,
-                               self.expctd_data.cell_vec.to('bohr').magnitude)
+        npt.assert_allclose(self.data.cell_vec.to('bohr').magnitude,
+                            self.expctd_data.cell_vec.to('bohr').magnitude,
+                            rtol=1e-12)
 
     def test_ion_r_read_fe_bands(self):
         self.assertFalse(hasattr(self.data, 'ion_r'))
@@ -119,12 +123,12 @@ class TestBandsDataFe(unittest.TestCase):
         self.assertFalse(hasattr(self.data, 'ion_type'))
 
     def test_qpts_read_fe_bands(self):
-        npt.assert_array_equal(self.data.qpts,
-                               self.expctd_data.qpts)
+        npt.assert_allclose(self.data.qpts, self.expctd_data.qpts,
+                            rtol=1e-12)
 
     def test_weights_read_fe_bands(self):
-        npt.assert_array_equal(self.data.weights,
-                               self.expctd_data.weights)
+        npt.assert_allclose(self.data.weights, self.expctd_data.weights,
+                            rtol=1e-12)
 
     def test_freqs_read_fe_bands(self):
         npt.assert_allclose(self.data.freqs.to('hartree').magnitude,
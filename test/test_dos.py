@@ -1,4 +1,5 @@
 import unittest
+from types import SimpleNamespace
 import numpy as np
 import numpy.testing as npt
 # Before Python 3.3 mock is an external module
@@ -13,8 +14,8 @@ from euphonic.data.bands import BandsData
 class TestCalculateDos(unittest.TestCase):
 
     def setUp(self):
-        # Create trivial function object so attributes can be assigned to it
-        iron = type('', (), {})()
+        # Create namespace object so attributes can be assigned to it
+        iron = SimpleNamespace()
         mock_data = Mock(
             spec=BandsData,
             _e_units = 'E_h',
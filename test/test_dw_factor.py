@@ -51,6 +51,18 @@ class TestDWFactorQuartz(unittest.TestCase):
             (self.data.n_ions, 3, 3))
         npt.assert_allclose(dw, expected_dw, atol=5e-10)
 
+    def test_dw_T5_2threads(self):
+        # Repeat the grid so there is more than one chunk of q-points to
+        # split between threads. Repeating every q-point doesn't change the
+        # weighted average, so should give the same result
+        qpts = np.tile(self.data.qpts, (17, 1))
+        self.data.calculate_fine_phonons(qpts, asr='reciprocal')
+        dw = self.data._dw_coeff(5, n_threads=2)
+        expected_dw = np.reshape(
+            np.loadtxt(os.path.join(self.dw_path, 'dw_T5.txt')),
+            (self.data.n_ions, 3, 3))
+        npt.assert_allclose(dw, expected_dw, atol=2e-14)
+
     def test_empty_idata_raises_exception(self):
         empty_data = InterpolationData.from_castep(self.seedname, self.path)
         self.assertRaises(Exception, empty_data._dw_coeff)
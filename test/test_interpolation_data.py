@@ -1,5 +1,6 @@
 import unittest
 import os
+from types import SimpleNamespace
 import numpy.testing as npt
 import numpy as np
 from euphonic import ureg
@@ -8,9 +9,10 @@ from euphonic.data.interpolation import InterpolationData
 
 class TestInputReadLZO(unittest.TestCase):
 
-    def setUp(self):
-        # Create trivial function object so attributes can be assigned to it
-        expctd_data = type('', (), {})()
+    @classmethod
+    def setUpClass(cls):
+        # Create namespace object so attributes can be assigned to it
+        expctd_data = SimpleNamespace()
         expctd_data.n_ions = 22
         expctd_data.n_branches = 66
         expctd_data.cell_vec = (np.array(
@@ -68,12 +70,12 @@ class TestInputReadLZO(unittest.TestCase):
                                              [1, 0, 0],
                                              [0, 1, 0],
                                              [0, 0, 1]])
-        self.expctd_data = expctd_data
+        cls.expctd_data = expctd_data
 
-        self.seedname = 'La2Zr2O7'
-        self.path = os.path.join('data', 'interpolation', 'LZO')
-        data = InterpolationData.from_castep(self.seedname, path=self.path)
-        self.data = data
+        cls.seedname = 'La2Zr2O7'
+        cls.path = os.path.join('data', 'interpolation', 'LZO')
+        data = InterpolationData.from_castep(cls.seedname, path=cls.path)
+        cls.data = data
 
     def test_n_ions_read(self):
         self.assertEqual(self.data.n_ions, self.expctd_data.n_ions)
@@ -386,9 +388,10 @@ class TestInterpolatePhononsLZO(unittest.TestCase):
 
 class TestInputReadGraphite(unittest.TestCase):
 
-    def setUp(self):
-        # Create trivial function object so attributes can be assigned to it
-        expctd_data = type('', (), {})()
+    @classmethod
+    def setUpClass(cls):
+        # Create namespace object so attributes can be assigned to it
+        expctd_data = SimpleNamespace()
         expctd_data.n_ions = 4
         expctd_data.n_branches = 12
         expctd_data.cell_vec = np.array([
@@ -434,12 +437,12 @@ class TestInputReadGraphite(unittest.TestCase):
              [0, 5, 1], [1, 5, 1], [2, 5, 1], [3, 5, 1], [4, 5, 1], [5, 5, 1],
              [6, 5, 1], [0, 6, 1], [1, 6, 1], [2, 6, 1], [3, 6, 1], [4, 6, 1],
              [5, 6, 1], [6, 6, 1]])
-        self.expctd_data = expctd_data
+        cls.expctd_data = expctd_data
 
-        self.seedname = 'graphite'
-        self.path = os.path.join('data', 'interpolation', 'graphite')
-        data = InterpolationData.from_castep(self.seedname, path=self.path)
-        self.data = data
+        cls.seedname = 'graphite'
+        cls.path = os.path.join('data', 'interpolation', 'graphite')
+        data = InterpolationData.from_castep(cls.seedname, path=cls.path)
+        cls.data = data
 
     def test_n_ions_read(self):
         self.assertEqual(self.data.n_ions, self.expctd_data.n_ions)
@@ -686,9 +689,10 @@ class TestInterpolatePhononsGraphite(unittest.TestCase):
 
 class TestInputReadQuartz(unittest.TestCase):
 
-    def setUp(self):
-        # Create trivial function object so attributes can be assigned to it
-        expctd_data = type('', (), {})()
+    @classmethod
+    def setUpClass(cls):
+        # Create namespace object so attributes can be assigned to it
+        expctd_data = SimpleNamespace()
         expctd_data.n_ions = 9
         expctd_data.n_branches = 27
         expctd_data.cell_vec = np.array([
@@ -777,12 +781,12 @@ class TestInputReadQuartz(unittest.TestCase):
             [2.49104301, 0.00000000, 0.00000000],
             [0.00000000, 2.49104301, 0.00000000],
             [0.00000000, 0.00000000, 2.52289805]])
-        self.expctd_data = expctd_data
+        cls.expctd_data = expctd_data
 
-        self.seedname = 'quartz'
-        self.path = os.path.join('data', 'interpolation', 'quartz')
-        data = InterpolationData.from_castep(self.seedname, path=self.path)
-        self.data = data
+        cls.seedname = 'quartz'
+        cls.path = os.path.join('data', 'interpolation', 'quartz')
+        data = InterpolationData.from_castep(cls.seedname, path=cls.path)
+        cls.data = data
 
     def test_n_ions_read(self):
         self.assertEqual(self.data.n_ions, self.expctd_data.n_ions)
@@ -1007,6 +1011,48 @@ class TestInterpolatePhononsQuartz(unittest.TestCase):
             self.expctd_split_freqs.to('hartree').magnitude,
             atol=1e-8)
 
+    def test_calculate_fine_phonons_dipole_recip_asr_split_no_evecs(self):
+        self.data.calculate_fine_phonons(
+            self.split_qpts, asr='reciprocal', dipole=True, splitting=True,
+            calc_eigenvecs=False)
+        npt.assert_array_equal(self.data.split_i, self.expctd_split_i)
+        npt.assert_allclose(
+            self.data.freqs.to('hartree').magnitude,
+            self.expctd_freqs_asr_splitting.to('hartree').magnitude,
+            atol=1e-8)
+        npt.assert_allclose(
+            self.data.split_freqs.to('hartree').magnitude,
+            self.expctd_split_freqs.to('hartree').magnitude,
+            atol=1e-8)
+        self.assertEqual(len(self.data.eigenvecs), 0)
+
+    def test_no_evecs_raises_exception(self):
+        # Test that methods requiring eigenvectors raise an Exception if
+        # calculate_fine_phonons was called with calc_eigenvecs=False
+        self.data.calculate_fine_phonons(
+            self.qpts, asr='reciprocal', dipole=True, calc_eigenvecs=False)
+        scattering_lengths = {'Si': 4.1491, 'O': 5.803}
+        msg = 'calc_eigenvecs=True'
+        self.assertRaisesRegex(Exception, msg, self.data.reorder_freqs)
+        self.assertRaisesRegex(Exception, msg,
+                               self.data.calculate_structure_factor,
+                               scattering_lengths)
+        self.assertRaisesRegex(Exception, msg, self.data._dw_coeff, 5.0)
+
+    def test_calculate_fine_phonons_dipole_recip_asr_split_float32(self):
+        self.data.calculate_fine_phonons(
+            self.split_qpts, asr='reciprocal', dipole=True, splitting=True,
+            dtype=np.float32)
+        npt.assert_array_equal(self.data.split_i, self.expctd_split_i)
+        npt.assert_allclose(
+            self.data.freqs.to('hartree').magnitude,
+            self.expctd_freqs_asr_splitting.to('hartree').magnitude,
+            atol=5e-6)
+        npt.assert_allclose(
+            self.data.split_freqs.to('hartree').magnitude,
+            self.expctd_split_freqs.to('hartree').magnitude,
+            atol=5e-6)
+
     def test_calculate_fine_phonons_dipole_recip_asr_split_c(self):
         self.data.calculate_fine_phonons(
             self.split_qpts, asr='reciprocal', dipole=True, splitting=True,
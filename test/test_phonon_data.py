@@ -1,4 +1,5 @@
 import unittest
+from types import SimpleNamespace
 import numpy.testing as npt
 import numpy as np
 from euphonic.data.phonon import PhononData
@@ -7,9 +8,10 @@ from euphonic import ureg
 
 class TestReadInputFileNaHPhonon(unittest.TestCase):
 
-    def setUp(self):
-        # Create trivial function object so attributes can be assigned to it
-        expctd_data = type('', (), {})()
+    @classmethod
+    def setUpClass(cls):
+        # Create namespace object so attributes can be assigned to it
+        expctd_data = SimpleNamespace()
         expctd_data.cell_vec = np.array(
             [[0.000000, 2.399500, 2.399500],
              [2.399500, 0.000000, 2.399500],
@@ -100,20 +102,20 @@ class TestReadInputFileNaHPhonon(unittest.TestCase):
                [-0.021140457173 + 0.000000000000*1j,
                 -0.024995270201 - 0.000000000000*1j,
                 -0.024995270201 + 0.000000000000*1j]]]])
-        self.expctd_data = expctd_data
+        cls.expctd_data = expctd_data
 
-        self.seedname = 'NaH'
-        self.path = 'data'
-        data = PhononData.from_castep(self.seedname, path=self.path)
-        self.data = data
+        cls.seedname = 'NaH'
+        cls.path = 'data'
+        data = PhononData.from_castep(cls.seedname, path=cls.path)
+        cls.data = data
 
     def test_cell_vec_read_nah_phonon(self):
         npt.assert_allclose(self.data.cell_vec.to('bohr').magnitude,
                             self.expctd_data.cell_vec.to('bohr').magnitude)
 
     def test_ion_r_read_nah_phonon(self):
-        npt.assert_array_equal(self.data.ion_r,
-                               self.expctd_data.ion_r)
+        npt.assert_allclose(self.data.ion_r, self.expctd_data.ion_r,
+                            rtol=1e-12)
 
     def test_ion_type_read_nah_phonon(self):
         npt.assert_array_equal(self.data.ion_type,
@@ -124,12 +126,12 @@ class TestReadInputFileNaHPhonon(unittest.TestCase):
                             self.expctd_data.ion_mass.to('amu').magnitude)
 
     def test_qpts_read_nah_phonon(self):
-        npt.assert_array_equal(self.data.qpts,
-                               self.expctd_data.qpts)
+        npt.assert_allclose(self.data.qpts, self.expctd_data.qpts,
+                            rtol=1e-12)
 
     def test_weights_read_nah_phonon(self):
-        npt.assert_array_equal(self.data.weights,
-                               self.expctd_data.weights)
+        npt.assert_allclose(self.data.weights, self.expctd_data.weights,
+                            rtol=1e-12)
 
     def test_freqs_read_nah_phonon(self):
         npt.assert_allclose(
@@ -137,5 +139,5 @@ class TestReadInputFileNaHPhonon(unittest.TestCase):
             self.expctd_data.freqs.to('hartree', 'spectroscopy').magnitude)
 
     def test_eigenvecs_read_nah_phonon(self):
-        npt.assert_array_equal(self.data.eigenvecs,
-                               self.expctd_data.eigenvecs)
+        npt.assert_allclose(self.data.eigenvecs, self.expctd_data.eigenvecs,
+                            rtol=1e-12)
@@ -1,4 +1,5 @@
 import unittest
+from types import SimpleNamespace
 import seekpath
 import matplotlib
 # Need to set non-interactive backend before importing euphonic to avoid
@@ -7,11 +8,14 @@ matplotlib.use('Agg')
 import numpy as np
 import numpy.testing as npt
 from matplotlib import figure
+from scipy import signal
 from euphonic import ureg
+from euphonic.data.phonon import PhononData
+from euphonic.util import gaussian_2d
 from euphonic.plot.dos import plot_dos
 from euphonic.plot.dispersion import (calc_abscissa, recip_space_labels,
                                       generic_qpt_labels, get_qpt_label,
-                                      plot_dispersion)
+                                      plot_dispersion, plot_sqw_map)
 
 
 class TestCalcAbscissa(unittest.TestCase):
@@ -30,9 +34,9 @@ class TestCalcAbscissa(unittest.TestCase):
                 [-0.29166667, -0.37500000, 0.04166667],
                 [-0.29166667, -0.37500000, 0.12500000],
                 [-0.29166667, -0.37500000, 0.29166667]]
-        expected_abscissa = [0., 0.13670299, 0.27340598, 1.48844879,
-                             2.75618022, 2.89288323, 3.78930474,
-                             4.33611674, 4.47281973, 4.74622573]
+        expected_abscissa = np.array([0., 0.13670299, 0.27340598, 1.48844879,
+                                      2.75618022, 2.89288323, 3.78930474,
+                                      4.33611674, 4.47281973, 4.74622573])
         npt.assert_allclose(calc_abscissa(qpts, recip),
                             expected_abscissa)
 
@@ -40,9 +44,9 @@ class TestCalcAbscissa(unittest.TestCase):
 class TestRecipSpaceLabels(unittest.TestCase):
 
     def setUp(self):
-        # Create trivial function object so attributes can be assigned to it
-        NaH = type('', (), {})()
-        data = type('', (), {})()
+        # Create namespace object so attributes can be assigned to it
+        NaH = SimpleNamespace()
+        data = SimpleNamespace()
         data.cell_vec = np.array(
             [[0.0, 2.3995, 2.3995],
              [2.3995, 0.0, 2.3995],
@@ -94,8 +98,8 @@ class TestGenericQptLabels(unittest.TestCase):
 class TestGetQptLabel(unittest.TestCase):
 
     def setUp(self):
-        # Create trivial function object so attributes can be assigned to it
-        NaH = type('', (), {})()
+        # Create namespace object so attributes can be assigned to it
+        NaH = SimpleNamespace()
         cell_vec = [[0.0, 2.3995, 2.3995],
                     [2.3995, 0.0, 2.3995],
                     [2.3995, 2.3995, 0.0]]
@@ -129,7 +133,7 @@ class TestPlotDispersion(unittest.TestCase):
 
     def setUp(self):
         # Input values
-        data = type('', (), {})()
+        data = SimpleNamespace()
         data._e_units = 'E_h'
         data.qpts = np.array([[0.00, 0.00, 0.00],
                               [0.50, 0.50, 0.50],
@@ -170,10 +174,12 @@ class TestPlotDispersion(unittest.TestCase):
         data.fermi = np.array([0.169316, 0.169316])*ureg('E_h')
         self.data = data
         self.title = 'Iron'
-        self.expected_abscissa = [0.0, 2.00911553, 3.42977475, 4.24999273,
-                                  5.54687123, 6.12685292]*ureg('1/bohr')
-        self.expected_xticks = [0.0, 2.00911553, 3.42977475, 4.24999273,
-                                5.54687123, 6.12685292]*ureg('1/bohr')
+        self.expected_abscissa = np.array(
+            [0.0, 2.00911553, 3.42977475, 4.24999273,
+             5.54687123, 6.12685292])*ureg('1/bohr')
+        self.expected_xticks = np.array(
+            [0.0, 2.00911553, 3.42977475, 4.24999273,
+             5.54687123, 6.12685292])*ureg('1/bohr')
         self.expected_xlabels = ['0 0 0', '1/2 1/2 1/2', '1/2 0 0',
                                  '0 0 0', '3/4 1/4 3/4', '1/2 0 0']
 
@@ -274,7 +280,7 @@ class TestPlotDispersion(unittest.TestCase):
 class TestPlotDos(unittest.TestCase):
 
     def setUp(self):
-        data = type('', (), {})()
+        data = SimpleNamespace()
         # Input values
         data._e_units = 'E_h'
         data.dos = np.array(
@@ -401,3 +407,35 @@ class TestPlotDos(unittest.TestCase):
         # the fermi energies and dos_down
         n_series = len(self.data.fermi) + 1
         self.assertEqual(len(fig.axes[0].get_lines()), n_series)
+
+
+class TestPlotSqwMap(unittest.TestCase):
+
+    def setUp(self):
+        self.data = PhononData.from_castep('La2Zr2O7', path='data')
+        self.data.calculate_sqw_map({'La': 8.24, 'Zr': 7.16, 'O': 5.803},
+                                    np.arange(0, 100, 0.5))
+
+    def tearDown(self):
+        # Ensure figures are closed after tests
+        matplotlib.pyplot.close('all')
+
+    def test_broadened_sqw_map(self):
+        ewidth = 5.0
+        qwidth = 0.1
+        fig, ims = plot_sqw_map(self.data, ewidth=ewidth, qwidth=qwidth)
+        self.assertIsInstance(fig, figure.Figure)
+        self.assertEqual(len(ims), self.data.n_qpts)
+        # Broadening should be the same as convolving with the full 2D
+        # Gaussian kernel
+        ebins = self.data.sqw_ebins.magnitude
+        qbin_width = np.linalg.norm(np.mean(np.absolute(
+            np.diff(self.data.qpts, axis=0)), axis=0))
+        qbins = np.linspace(0, qbin_width*self.data.n_qpts + qbin_width,
+                            self.data.n_qpts + 1)
+        expected_sqw_map = signal.fftconvolve(
+            self.data.sqw_map,
+            np.transpose(gaussian_2d(qbins, ebins, qwidth, ewidth)), 'same')
+        sqw_map = np.array([im.get_array()[:, 0] for im in ims])
+        npt.assert_allclose(sqw_map, expected_sqw_map,
+                            atol=1e-12*np.amax(expected_sqw_map))
@@ -52,6 +52,15 @@ class TestStructureFactorPhononDataLZO(unittest.TestCase):
             self.sf_path, 'sf_pdata_dw_T100.txt'))
         npt.assert_allclose(sf, expected_sf, rtol=2e-6)
 
+    def test_sf_T5_dw_float32(self):
+        sf = self.data.calculate_structure_factor(
+            self.scattering_lengths, T=5, dw_data=self.dw_data,
+            dtype=np.float32)
+        expected_sf = np.loadtxt(os.path.join(
+            self.sf_path, 'sf_pdata_dw_T5.txt'))
+        self.assertEqual(sf.dtype, np.float32)
+        npt.assert_allclose(sf, expected_sf, atol=1e-5*np.max(expected_sf))
+
 
 class TestStructureFactorInterpolationDataLZOSerial(unittest.TestCase):
 
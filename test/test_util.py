@@ -3,7 +3,8 @@ import unittest
 import math
 import numpy as np
 import numpy.testing as npt
-from euphonic.util import reciprocal_lattice, direction_changed, mp_grid
+from euphonic.util import (reciprocal_lattice, direction_changed, mp_grid,
+                           gaussian, gaussian_1d, gaussian_2d)
 
 
 class TestReciprocalLattice(unittest.TestCase):
@@ -58,3 +59,31 @@ class TestMPGrid(unittest.TestCase):
         qpts = mp_grid([4,4,4])
         expected_qpts = np.loadtxt(os.path.join('data','qgrid_444.txt'))
         npt.assert_equal(qpts, expected_qpts)
+
+
+class TestGaussian(unittest.TestCase):
+
+    def setUp(self):
+        self.xbins = np.arange(0, 10.01, 0.1)
+        self.ybins = np.arange(0, 100.01, 0.5)
+        self.xwidth = 0.7
+        self.ywidth = 4.0
+        # Evaluate the 2D Gaussian directly on the full grid
+        x_sigma = self.xwidth/(2*math.sqrt(2*math.log(2)))
+        y_sigma = self.ywidth/(2*math.sqrt(2*math.log(2)))
+        nx = int(np.ceil(2*6.0*x_sigma/0.1)/2)*2 + 1
+        ny = int(np.ceil(2*6.0*y_sigma/0.5)/2)*2 + 1
+        x = np.linspace(-6.0*x_sigma, 6.0*x_sigma, nx)
+        y = np.linspace(-6.0*y_sigma, 6.0*y_sigma, ny)
+        ygrid, xgrid = np.meshgrid(y, x, indexing='ij')
+        gauss = gaussian(xgrid, x_sigma)*gaussian(ygrid, y_sigma)
+        self.expected_gauss_2d = gauss/np.sum(gauss)
+
+    def test_gaussian_1d_outer_matches_2d(self):
+        gauss = np.outer(gaussian_1d(self.ybins, self.ywidth),
+                         gaussian_1d(self.xbins, self.xwidth))
+        npt.assert_allclose(gauss, self.expected_gauss_2d, rtol=1e-12)
+
+    def test_gaussian_2d(self):
+        gauss = gaussian_2d(self.xbins, self.ybins, self.xwidth, self.ywidth)
+        npt.assert_allclose(gauss, self.expected_gauss_2d, rtol=1e-12)